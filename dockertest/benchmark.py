@@ -0,0 +1,53 @@
+"""
+Summarize latency and throughput measurements as autotest perf keyvals.
+
+Latencies are lists of seconds.  Percentiles use the nearest-rank method,
+so every reported value is one which was actually measured.
+"""
+
+import math
+
+#: Default percentiles reported by ``latency_keyvals()``
+PERCENTS = (50, 95, 99)
+
+
+def percentile(values, percent):
+    """
+    Return nearest-rank ``percent`` percentile of values
+
+    :param values: Non-empty iterable of numbers
+    :param percent: Number from 0 to 100
+    :raises ValueError: If values is empty or percent out of range
+    """
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("Percentile of no values")
+    if percent < 0 or percent > 100:
+        raise ValueError("Percent %s not between 0 and 100" % percent)
+    rank = int(math.ceil(percent / 100.0 * len(ordered)))
+    return ordered[max(rank, 1) - 1]
+
+
+def latency_keyvals(prefix, latencies, elapsed=None, percents=PERCENTS):
+    """
+    Return dictionary of perf keyvals summarizing latencies, e.g.
+    ``<prefix>_count``, ``<prefix>_mean``, ``<prefix>_p95``, and when
+    elapsed is given, ``<prefix>_per_sec``.
+
+    :param prefix: Prefix for each key, must only contain ``[-.\\w]``
+    :param latencies: List of seconds each operation took
+    :param elapsed: Total seconds for all operations, None to omit rate
+    :param percents: Iterable of percentiles to report
+    """
+    keyvals = {'%s_count' % prefix: len(latencies)}
+    if elapsed is not None and elapsed > 0:
+        keyvals['%s_per_sec' % prefix] = len(latencies) / float(elapsed)
+    if not latencies:
+        return keyvals
+    keyvals['%s_min' % prefix] = min(latencies)
+    keyvals['%s_mean' % prefix] = sum(latencies) / float(len(latencies))
+    keyvals['%s_max' % prefix] = max(latencies)
+    for percent in percents:
+        keyvals['%s_p%d' % (prefix, percent)] = percentile(latencies,
+                                                           percent)
+    return keyvals
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+# Pylint runs from a different directory, it's fine to import this way
+# pylint: disable=W0403
+
+import unittest
+
+
+class TestPercentile(unittest.TestCase):
+
+    def setUp(self):
+        import benchmark
+        self.benchmark = benchmark
+
+    def test_nearest_rank(self):
+        values = [15, 20, 35, 40, 50]
+        percentile = self.benchmark.percentile
+        self.assertEqual(percentile(values, 0), 15)
+        self.assertEqual(percentile(values, 30), 20)
+        self.assertEqual(percentile(values, 40), 20)
+        self.assertEqual(percentile(values, 50), 35)
+        self.assertEqual(percentile(reversed(values), 100), 50)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_bad(self):
+        self.assertRaises(ValueError, self.benchmark.percentile, [], 50)
+        self.assertRaises(ValueError, self.benchmark.percentile, [1], 101)
+
+
+class TestLatencyKeyvals(unittest.TestCase):
+
+    def setUp(self):
+        import benchmark
+        self.benchmark = benchmark
+
+    def test_keyvals(self):
+        keyvals = self.benchmark.latency_keyvals('foo', [0.1] * 99 + [1.0],
+                                                 elapsed=20.0)
+        self.assertEqual(keyvals['foo_count'], 100)
+        self.assertAlmostEqual(keyvals['foo_per_sec'], 5.0)
+        self.assertAlmostEqual(keyvals['foo_mean'], 0.109)
+        self.assertEqual(keyvals['foo_p50'], 0.1)
+        self.assertEqual(keyvals['foo_p99'], 0.1)
+        self.assertEqual(keyvals['foo_max'], 1.0)
+
+    def test_empty(self):
+        self.assertEqual(self.benchmark.latency_keyvals('bar', []),
+                         {'bar_count': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
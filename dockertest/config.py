@@ -10,10 +10,13 @@ unit-tested but not intended for wide-spread general use.
 # pylint: disable=W0403
 
 from ConfigParser import SafeConfigParser
-from collections import MutableMapping
+from collections import Mapping, MutableMapping
+import os
 import os.path
 import sys
 import copy
+import json
+import tempfile
 
 import xceptions
 
@@ -39,6 +42,12 @@ DEFAULTSFILE = 'defaults.ini'
 #: Name of file holding special control script options
 CONTROLFILE = 'control.ini'
 
+#: Name of (hidden) file in CONFIGCUSTOMS caching fully merged configuration
+CONFIGCACHE = '.config_cache.json'
+
+#: Format version of CONFIGCACHE contents, increment on any change
+CONFIGCACHEVERSION = 1
+
 
 class ConfigSection(object):
 
@@ -308,6 +317,164 @@ class ConfigDict(MutableMapping):
                                       % filelike.name)
 
 
+class ConfigView(MutableMapping):
+
+    r"""
+    Dict-like of per-section dicts, copied-on-access from a shared base.
+
+    :param base: Dictionary of section dictionaries, never modified.
+    :param \*args: Same as built-in python ``dict()`` params.
+    :param \*\*dargs: Same as built-in python ``dict()`` params.
+    """
+
+    def __init__(self, base, *args, **dargs):
+        self._base = base
+        # Sections copied from base, or set on this instance
+        self._overlay = {}
+        # Section names removed from this instance, but still in base
+        self._deleted = set()
+        # pylint: disable=E1101
+        super(ConfigView, self).__init__()
+        self.update(*args, **dargs)
+
+    def __getitem__(self, key):
+        try:
+            return self._overlay[key]
+        except KeyError:
+            if key in self._deleted:
+                raise
+        # Caller may modify section, never hand out base's copy
+        section = self._overlay[key] = dict(self._base[key])
+        return section
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __contains__(self, key):
+        if key in self._overlay:
+            return True
+        return key in self._base and key not in self._deleted
+
+    def __iter__(self):
+        for key in self._overlay:
+            yield key
+        for key in self._base:
+            if key not in self._overlay and key not in self._deleted:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __deepcopy__(self, memo):
+        the_copy = self.__class__(self._base)
+        # pylint: disable=W0212
+        the_copy._overlay = copy.deepcopy(self._overlay, memo)
+        the_copy._deleted = set(self._deleted)
+        return the_copy
+
+    def copy(self):
+        """
+        Return new view of same base, sections already accessed are shared
+        """
+        the_copy = self.__class__(self._base)
+        # pylint: disable=W0212
+        the_copy._overlay = self._overlay.copy()
+        the_copy._deleted = set(self._deleted)
+        return the_copy
+
+
+class LazyConfigs(Mapping):
+
+    r"""
+    Read-only dict-like of section dicts, each parsed on first access.
+
+    :param configdirs: Directories of ``ini`` files, later ones override
+                       sections from earlier ones.
+    :param defaults_dict: Dict-like containing all default option/values.
+    """
+
+    # Mapping has no state to initialize
+    # pylint: disable=W0231
+
+    #: Same section header pattern ``SafeConfigParser`` uses
+    sectcre = SafeConfigParser.SECTCRE
+
+    def __init__(self, configdirs, defaults_dict):
+        self._loaded = {'DEFAULTS': defaults_dict}
+        # Section name to list of paths to files defining it, in load order
+        self._index = {}
+        for configdir in configdirs:
+            for dirpath, dirnames, filenames in os.walk(configdir,
+                                                        followlinks=True):
+                del dirnames  # not needed
+                self.index_config_dir(dirpath, filenames, self._index)
+
+    @classmethod
+    def index_config_dir(cls, dirpath, filenames, index):
+        """
+        Add section names found in ini filenames to index w/o parsing options
+
+        :param dirpath: Path to directory of ``ini`` files to index
+        :param filenames: List of filenames in directory.
+        :param index: Dict of section name to list of full paths to update
+        """
+        for filename in filenames:
+            # Must skip exactly the same files as Config.load_config_dir()
+            if filename in CONTROLFILE or filename in DEFAULTSFILE:
+                continue
+            if filename.startswith('.') or not filename.endswith('.ini'):
+                continue
+            fullpath = os.path.join(dirpath, filename)
+            for line in open(fullpath, 'r'):
+                # Indented lines are option value continuations
+                if not line or line[0].isspace() or line[0] in '#;':
+                    continue
+                mobj = cls.sectcre.match(line)
+                if mobj is None or mobj.group('header') == 'DEFAULTS':
+                    continue
+                paths = index.setdefault(mobj.group('header'), [])
+                if fullpath not in paths:
+                    paths.append(fullpath)
+
+    def __getitem__(self, section):
+        try:
+            return self._loaded[section]
+        except KeyError:
+            paths = self._index[section]  # Raise KeyError if undefined
+        configs_dict = {'DEFAULTS': self._loaded['DEFAULTS']}
+        for path in paths:
+            newcd = ConfigDict(section, configs_dict['DEFAULTS'])
+            newcd.read(open(path, 'r'))
+            if section not in configs_dict:
+                configs_dict[section] = dict(newcd.items())
+                continue  # all defaults, no processing of __example__
+            Config.load_config_sec(newcd, section, configs_dict)
+        self._loaded[section] = configs_dict[section]
+        return self._loaded[section]
+
+    def __contains__(self, section):
+        return section in self._loaded or section in self._index
+
+    def __iter__(self):
+        yield 'DEFAULTS'
+        for section in self._index:
+            yield section
+
+    def __len__(self):
+        return len(self._index) + 1
+
+
 class Config(dict):
 
     r"""
@@ -315,8 +482,9 @@ class Config(dict):
 
     :param \*args: Same as built-in python ``dict()`` params.
     :param \*\*dargs: Same as built-in python ``dict()`` params.
-    :return: Regular 'ole python dictionary of global config also as
-             python dictionaries (cached on first load)
+    :return: ``ConfigView`` dict-like of global config sections as
+             python dictionaries (cached on first load).  Each section
+             is copied only when first accessed.
     """
     #: Public instance attribute cache of defaults parsing w/ non-clashing name
     defaults_ = None
@@ -324,19 +492,21 @@ class Config(dict):
     configs_ = None
     #: private class-attribute cache used to return copy as a dict in __new__()
     _singleton = None
-    #: prepared dict for deep copy.
+    #: prepared dict, shared base of all ``ConfigView`` instances.
     prepdict = None
 
     def __new__(cls, *args, **dargs):
         if cls._singleton is None:
-            # Apply *args, *dargs _after_ making deep-copy
             cls._singleton = dict.__new__(cls)
             if cls._singleton.prepdict is None:
-                cls._singleton.prepdict = cls._singleton.copy()
-        deep_copy = copy.deepcopy(cls._singleton.prepdict)
-        deep_copy.update(dict(*args, **dargs))
+                configs = cls._singleton.configs
+                if isinstance(configs, LazyConfigs):
+                    # Copying would load every section
+                    cls._singleton.prepdict = configs
+                else:
+                    cls._singleton.prepdict = cls._singleton.copy()
         # Prevent any modifications from affecting cache and/or other tests
-        return deep_copy
+        return ConfigView(cls._singleton.prepdict, *args, **dargs)
 
     @property
     def defaults(self):
@@ -446,12 +616,99 @@ class Config(dict):
                 # differs from existing (default) value in configs_dict.
                 Config.load_config_sec(newcd, section, configs_dict)
 
+    @staticmethod
+    def config_manifest():
+        """
+        Return sorted list of [path, size, mtime] for every ini file
+
+        :return: List of lists, comparable with one loaded from JSON.
+        """
+        manifest = []
+        for configdir in (CONFIGDEFAULT, CONFIGCUSTOMS):
+            for dirpath, dirnames, filenames in os.walk(configdir,
+                                                        followlinks=True):
+                del dirnames  # not needed
+                for filename in filenames:
+                    if filename.startswith('.') or not filename.endswith(
+                            '.ini'):
+                        continue
+                    fullpath = os.path.join(dirpath, filename)
+                    stat = os.stat(fullpath)
+                    manifest.append([fullpath, stat.st_size, stat.st_mtime])
+        manifest.sort()
+        return manifest
+
+    @staticmethod
+    def load_config_cache(manifest):
+        """
+        Return configs dict from CONFIGCACHE file, if it matches manifest
+
+        :param manifest: Current list as returned by ``config_manifest()``
+        :return: Dict of section dicts or None if missing/stale/unreadable
+        """
+        cache_path = os.path.join(CONFIGCUSTOMS, CONFIGCACHE)
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                cache = _from_json(json.load(cache_file))
+            if (cache['version'] != CONFIGCACHEVERSION or
+                    cache['manifest'] != manifest):
+                return None
+            return cache['configs']
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def store_config_cache(manifest, configs_dict):
+        """
+        Atomically replace CONFIGCACHE file, ignoring any failures
+
+        :param manifest: List as returned by ``config_manifest()`` *before*
+                         any ini files were parsed.
+        :param configs_dict: Fully merged dict of section dicts
+        """
+        cache = {'version': CONFIGCACHEVERSION,
+                 'manifest': manifest,
+                 'configs': configs_dict}
+        tmppath = None
+        try:
+            (fdes, tmppath) = tempfile.mkstemp(prefix=CONFIGCACHE,
+                                               dir=CONFIGCUSTOMS)
+            with os.fdopen(fdes, 'wb') as tmpfile:
+                json.dump(cache, tmpfile)
+            os.rename(tmppath, os.path.join(CONFIGCUSTOMS, CONFIGCACHE))
+        except (IOError, OSError, TypeError, ValueError):
+            # Cache is optional, e.g. read-only CONFIGCUSTOMS, but don't
+            # leave partial files behind.
+            if tmppath is not None and os.path.isfile(tmppath):
+                os.unlink(tmppath)
+
+    @staticmethod
+    def config_cache_writable():
+        """
+        Return True if ``store_config_cache()`` is able to write CONFIGCACHE
+        """
+        return os.access(CONFIGCUSTOMS, os.W_OK)
+
     @property
     def configs(self):
         """
         Read-only cached dict of ConfigDict's by section, aggregating all ini's
         """
         if self.__class__.configs_ is None:
+            # Skip all parsing when no ini file was added/removed/changed
+            manifest = self.config_manifest()
+            configs_ = self.load_config_cache(manifest)
+            if configs_ is not None:
+                self.__class__.defaults_ = configs_['DEFAULTS']
+                self.__class__.configs_ = configs_
+                return self.__class__.configs_
+            # Full parse is wasted when cache can't be stored for next time,
+            # instead parse sections only as they're accessed.
+            if not self.config_cache_writable():
+                self.__class__.configs_ = LazyConfigs((CONFIGDEFAULT,
+                                                       CONFIGCUSTOMS),
+                                                      self.defaults)
+                return self.__class__.configs_
             self.__class__.configs_ = {'DEFAULTS': self.defaults}
             # Overwrite section-by-section from customs after loading defaults
             for dirpath, dirnames, filenames in os.walk(CONFIGDEFAULT,
@@ -464,6 +721,7 @@ class Config(dict):
                 del dirnames  # not needed
                 self.load_config_dir(dirpath, filenames,
                                      self.__class__.configs_, self.defaults)
+            self.store_config_cache(manifest, self.__class__.configs_)
         return self.__class__.configs_
 
     def copy(self):
@@ -481,6 +739,20 @@ class Config(dict):
         return the_copy
 
 
+def _from_json(value):
+    """
+    Return value loaded from JSON with all unicode converted to str
+    """
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    if isinstance(value, dict):
+        return dict([(_from_json(key), _from_json(item))
+                     for key, item in value.items()])
+    return value
+
+
 def get_as_list(value, sep=",", omit_empty=True):
     """
     Return config value as list separated by sep.
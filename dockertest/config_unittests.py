@@ -190,6 +190,93 @@ class TestConfig(ConfigTestBase):
         bar = self.config.Config()
         self.assertNotEqual(id(foo), id(bar))
 
+    def test_copy_on_write(self):
+        foo = self.config.Config()
+        bar = self.config.Config()
+        foo['TestSection']['testoptions'] = 'modified'
+        del foo['DEFAULTS']
+        foo['NewSection'] = {'testoptions': 'new'}
+        self.assertEqual(sorted(foo.keys()), ['NewSection', 'TestSection'])
+        self.assertEqual(len(bar), 2)
+        self.assertEqual(bar['TestSection']['testoptions'], "baz!")
+        self.assertEqual(self.config.Config()['TestSection']['testoptions'],
+                         "baz!")
+        self.assertRaises(KeyError, foo.__getitem__, 'DEFAULTS')
+        self.assertEqual(foo.get('NewSection'), {'testoptions': 'new'})
+
+    def test_deepcopy(self):
+        import copy
+        foo = self.config.Config(NewSection={'testoptions': 'new'})
+        bar = copy.deepcopy(foo)
+        bar['NewSection']['testoptions'] = 'modified'
+        self.assertEqual(foo['NewSection']['testoptions'], 'new')
+        self.assertEqual(dict(bar.items()), dict(copy.deepcopy(bar).items()))
+
+    def test_config_cache(self):
+        expected = self.config.Config().copy()
+        cache_path = os.path.join(self.config.CONFIGCUSTOMS,
+                                  self.config.CONFIGCACHE)
+        self.assertTrue(os.path.isfile(cache_path))
+        # Simulate a new process, which must not parse any ini files
+        self.config.Config.defaults_ = None
+        self.config.Config.configs_ = None
+        load_config_dir = self.config.Config.load_config_dir
+        self.config.Config.load_config_dir = None
+        try:
+            self.assertEqual(self.config.Config.configs_, None)
+            self.assertEqual(dict.__new__(
+                self.config.Config).configs, expected)
+        finally:
+            self.config.Config.load_config_dir = load_config_dir
+
+    def test_config_cache_stale(self):
+        self.config.Config()
+        bar = self.config.ConfigSection(None, 'TestSection')
+        bar.set('TesTopTIONs', "changed!")
+        bar.merge_write(self.cfgfile)
+        self.config.Config.defaults_ = None
+        self.config.Config.configs_ = None
+        configs = dict.__new__(self.config.Config).configs
+        self.assertEqual(configs['TestSection']['testoptions'], "changed!")
+
+    def test_config_cache_store_failure(self):
+        self.config.Config()
+        before = sorted(os.listdir(self.config.CONFIGCUSTOMS))
+        # Not JSON serializable, fails part-way through writing
+        self.config.Config.store_config_cache([], {'bad': object()})
+        self.assertEqual(sorted(os.listdir(self.config.CONFIGCUSTOMS)),
+                         before)
+
+    def test_lazy(self):
+        bar = self.config.ConfigSection(None, 'TestSection')
+        bar.set('__example__', 'testoptionb')
+        bar.set('TestOptionB', True)
+        osfd, filename = tempfile.mkstemp(suffix='.ini',
+                                          dir=self.config.CONFIGCUSTOMS)
+        os.close(osfd)
+        cfgfile = open(filename, 'wb')
+        bar.write(cfgfile)
+        baz = self.config.ConfigSection(None, 'OtherSection')
+        baz.merge_write(cfgfile)
+        cfgfile.close()
+        expected = self.config.Config().copy()
+        os.unlink(os.path.join(self.config.CONFIGCUSTOMS,
+                               self.config.CONFIGCACHE))
+        self.config.Config.defaults_ = None
+        self.config.Config.configs_ = None
+        # Can't store cache, e.g. read-only CONFIGCUSTOMS
+        self.config.Config.config_cache_writable = staticmethod(lambda: False)
+        configs = dict.__new__(self.config.Config).configs
+        self.assertTrue(isinstance(configs, self.config.LazyConfigs))
+        self.assertEqual(sorted(configs.keys()),
+                         ['DEFAULTS', 'OtherSection', 'TestSection'])
+        self.assertTrue('OtherSection' in configs)
+        self.assertFalse('OtherSection' in configs._loaded)
+        self.assertEqual(configs['TestSection'], expected['TestSection'])
+        self.assertFalse('OtherSection' in configs._loaded)
+        self.assertEqual(dict(configs.items()), dict(expected.items()))
+        self.assertRaises(KeyError, configs.__getitem__, 'NotASection')
+
     def test_multi_sections(self):
         osfd, filename = tempfile.mkstemp(suffix='.ini',
                                           dir=self.config.CONFIGDEFAULT)
@@ -10,6 +10,7 @@ import logging
 import socket
 import json
 import re
+import time
 from autotest.client import utils
 
 
@@ -95,6 +96,23 @@ class SocketClient(ClientBase):
         self._connection.request("GET", resource)
         return self._connection.getresponse()  # httplib.HTTPResponse
 
+    def post(self, resource, body=None):
+        """
+        POST to resource, e.g. ``/containers/<id>/kill?signal=10``
+
+        :param resource: Path and query string of resource
+        :param body: Optional request body string
+        :return: httplib.HTTPResponse instance, read it before next request
+        """
+        self._connection.request("POST", resource, body)
+        return self._connection.getresponse()
+
+    def close(self):
+        """
+        Close connection to the socket (reopened by next ``get()``)
+        """
+        self._connection.close()
+
     @staticmethod
     def value_to_json(value):
         if value.status != 200:
@@ -111,6 +129,46 @@ class SocketClient(ClientBase):
 
 # Group of utils for managing docker daemon service.
 
+#: Private cache of ``service``, ``main_pid``, ``pid``, ``start_time``, and
+#: ``cmdline`` of the running docker daemon (do not use, see ``invalidate()``)
+_DAEMON = {}
+
+
+def invalidate(keep_service=False):
+    """
+    Forget cached docker daemon details and ``DaemonCache`` output, they'll
+    be re-discovered on demand.  Called automatically by ``stop()``,
+    ``start()``, and ``restart()``.
+
+    :param keep_service: When True, remember the systemd service name
+    """
+    # Imported here because daemoncache imports this module
+    from dockertest.output.daemoncache import DaemonCache
+    service = _DAEMON.get('service')
+    _DAEMON.clear()
+    if keep_service and service is not None:
+        _DAEMON['service'] = service
+    DaemonCache.invalidate()
+
+
+def _cached(key):
+    """
+    Return cached daemon detail for key, or None if missing or the daemon
+    process is no longer the one which was cached.
+    """
+    if key not in _DAEMON:
+        return None
+    cached_pid = _DAEMON.get('pid')
+    if cached_pid is not None:
+        try:
+            still_running = start_time(cached_pid) == _DAEMON['start_time']
+        except (IOError, OSError, IndexError, ValueError):
+            still_running = False
+        if not still_running:
+            invalidate(keep_service=True)
+            return _DAEMON.get(key)
+    return _DAEMON[key]
+
 
 def which_docker():
     """
@@ -118,6 +176,9 @@ def which_docker():
     as a string. This is usually 'docker' but could be 'docker-latest'
     or the name of a known docker-as-system-container service.
     """
+    docker = _cached('service')
+    if docker is not None:
+        return docker
     docker = 'docker'
 
     # Known docker-daemon services as of July 2017
@@ -133,6 +194,7 @@ def which_docker():
             unit = found_running.group(1)
             if unit in docker_services:
                 docker = unit
+    _DAEMON['service'] = docker
     return docker
 
 
@@ -140,19 +202,93 @@ def _systemd_action(action):
     return utils.run("systemctl %s %s.service" % (action, which_docker()))
 
 
+def ping(uri="/var/run/docker.sock", containers=()):
+    """
+    Returns True if daemon answers ``/_ping`` on unix socket uri, and
+    can inspect every container in containers.
+
+    :param uri: Path to docker daemon's unix socket
+    :param containers: Iterable of container names or IDs which must exist
+    """
+    client = SocketClient(uri)
+    try:
+        response = client.get('/_ping')
+        # Whole body must be read before re-using connection
+        if response.read().strip() != 'OK' or response.status != 200:
+            return False
+        for container in containers:
+            response = client.get('/containers/%s/json' % container)
+            response.read()
+            if response.status != 200:
+                return False
+        return True
+    except (socket.error, httplib.HTTPException):
+        return False
+    finally:
+        client.close()
+
+
+def wait_ready(timeout=60.0, containers=(), uri="/var/run/docker.sock"):
+    """
+    Wait for ``ping()`` to succeed, polling with exponential backoff.
+
+    :param timeout: Maximum seconds to wait
+    :param containers: Iterable of container names or IDs which must exist
+    :param uri: Path to docker daemon's unix socket
+    :raises RuntimeError: If daemon isn't ready within timeout seconds
+    :returns: Seconds waited
+    """
+    started = time.time()
+    deadline = started + timeout
+    delay = 0.01
+    while not ping(uri, containers):
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise RuntimeError("Docker daemon not ready on %s after %0.2f"
+                               " seconds" % (uri, timeout))
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 1.0)
+    return time.time() - started
+
+
 def stop():
     """ stop the docker daemon """
-    return _systemd_action('stop')
+    try:
+        return _systemd_action('stop')
+    finally:
+        invalidate(keep_service=True)
 
 
-def start():
-    """ start the docker daemon """
-    return _systemd_action('start')
+def start(ready_timeout=60.0, containers=()):
+    """
+    start the docker daemon, and wait for it to become ready
+
+    :param ready_timeout: Seconds to ``wait_ready()``, None to not wait
+    :param containers: Passed through to ``wait_ready()``
+    """
+    try:
+        result = _systemd_action('start')
+    finally:
+        invalidate(keep_service=True)
+    if ready_timeout is not None:
+        wait_ready(ready_timeout, containers)
+    return result
 
 
-def restart():
-    """ restart the docker daemon """
-    return _systemd_action('restart')
+def restart(ready_timeout=60.0, containers=()):
+    """
+    restart the docker daemon, and wait for it to become ready
+
+    :param ready_timeout: Seconds to ``wait_ready()``, None to not wait
+    :param containers: Passed through to ``wait_ready()``
+    """
+    try:
+        result = _systemd_action('restart')
+    finally:
+        invalidate(keep_service=True)
+    if ready_timeout is not None:
+        wait_ready(ready_timeout, containers)
+    return result
 
 
 def systemd_show(prop):
@@ -170,15 +306,30 @@ def systemd_show(prop):
 
 def pid():
     """ returns the process ID of currently-running docker daemon """
+    daemon_pid = _cached('pid')
+    if daemon_pid is not None:
+        return daemon_pid
     mainpid = int(systemd_show('MainPID'))
+    daemon_pid = _find_dockerd(mainpid)
+    try:
+        # Only cache what can be re-validated
+        _DAEMON['start_time'] = start_time(daemon_pid)
+        _DAEMON['main_pid'] = mainpid
+        _DAEMON['pid'] = daemon_pid
+    except (IOError, OSError, IndexError, ValueError):
+        pass
+    return daemon_pid
+
+
+def _find_dockerd(mainpid):
     cmd = cmdline(mainpid)
-    if 'dockerd' in cmd[0]:
+    if cmd and 'dockerd' in cmd[0]:
         return mainpid
     # As of April 2017 we may be running dockerd under runc. If so, actual
     # dockerd process is an immediate child of the one returned by systemd.
     for child_pid in utils.run("pgrep -P %s" % mainpid).stdout.split():
         cmd = cmdline(child_pid)
-        if 'dockerd' in cmd[0]:
+        if cmd and 'dockerd' in cmd[0]:
             return int(child_pid)
     # Urp. No dockerd process found. Cross fingers & hope systemd is right.
     logging.warning("docker_daemon.pid(): systemd reports %d,"
@@ -187,18 +338,48 @@ def pid():
     return mainpid
 
 
+def start_time(process_id):
+    """
+    Returns start time of process_id in clock ticks after boot, as read
+    from /proc. Unlike a PID, never repeats for a different process.
+
+    :param process_id: PID whose start time to read
+    """
+    with open('/proc/%d/stat' % int(process_id), 'r') as stat:
+        # Command name (2nd field) may contain spaces, skip past it
+        fields = stat.read().rsplit(')', 1)[1].split()
+    # starttime is the 22nd field, 20th after the command name
+    return int(fields[19])
+
+
+def fingerprint():
+    """
+    Returns a string identifying the currently-running docker daemon
+    instance. It changes whenever the daemon is (re)started.
+    """
+    daemon_pid = pid()
+    return '%d:%d' % (daemon_pid, start_time(daemon_pid))
+
+
 def cmdline(process_id=None):
     """
-    Returns the command line (argv) for the given process_id, as obtained
-    from 'ps'. We don't use 'systemctl show' because that includes
+    Returns the command line (argv) for the given process_id, as read
+    from /proc. We don't use 'systemctl show' because that includes
     unexpanded variables. Return value is a list of strings.
 
     :param process_id: PID whose commandline we read (default: docker daemon)
     """
     if process_id is None:
-        process_id = pid()
-    ps_command = 'ps -o command= -p %d' % int(process_id)
-    return utils.run(ps_command).stdout.strip().split()
+        argv = _cached('cmdline')
+        if argv is not None:
+            return list(argv)
+        argv = cmdline(pid())
+        if 'pid' in _DAEMON:  # Only cache what can be re-validated
+            _DAEMON['cmdline'] = argv
+        return list(argv)
+    with open('/proc/%d/cmdline' % int(process_id), 'rb') as cmdfile:
+        # NUL separated and terminated
+        return cmdfile.read().split('\0')[:-1]
 
 
 def user_namespaces_enabled():
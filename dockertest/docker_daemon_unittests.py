@@ -68,6 +68,13 @@ class DDTestBase(unittest2.TestCase):
     def setUp(self):
         import docker_daemon
         self.dd = docker_daemon
+        # Don't let other tests' cached daemon details interfere
+        self.dd.invalidate()
+        self.cmdline = self.dd.cmdline
+
+    def tearDown(self):
+        self.dd.cmdline = self.cmdline
+        del FAKERUN_RESULTS[:]
 
 
 class DDTest(DDTestBase):
@@ -94,7 +101,7 @@ class DDTest(DDTestBase):
         self.assertEqual(i.interface, None)
 
 
-class TestWhichDocker(unittest2.TestCase):
+class TestWhichDocker(DDTestBase):
     """
     Tests for which_docker()
     """
@@ -150,7 +157,7 @@ To show all installed unit files use 'systemctl list-unit-files'.
         self.assertEqual(actual, expect, "which_docker()")
 
 
-class TestSystemdShow(unittest2.TestCase):
+class TestSystemdShow(DDTestBase):
     """
     Tests for systemd_show()
     """
@@ -187,14 +194,170 @@ class TestSystemdShow(unittest2.TestCase):
 
         # It also checks the docker daemon command line, because it has to
         # distinguish between dockerd itself and dockerd run under runc
-        # (as a container). The third fakerun_setup() simulates the
-        # output of 'ps' on our pid.
+        # (as a container). Simulate /proc/<pid>/cmdline of our pid.
         fakerun_setup(stdout="\n")                      # for which_docker()
         fakerun_setup(stdout="MainPID=12345\n")
-        fakerun_setup(stdout="/usr/bin/dockerd --add-runtime ...\n")
+        docker_daemon.cmdline = lambda _: ['/usr/bin/dockerd', '--foo']
 
         self.assertEqual(docker_daemon.pid(), 12345, 'daemon pid')
 
 
+class TestFingerprint(DDTestBase):
+    """
+    Tests for start_time() and fingerprint()
+    """
+
+    def test_start_time(self):
+        import os
+        import docker_daemon
+        mine = docker_daemon.start_time(os.getpid())
+        self.assertTrue(mine > 0)
+        self.assertTrue(docker_daemon.start_time(1) <= mine)
+
+    def test_fingerprint(self):
+        import os
+        import docker_daemon
+        mypid = os.getpid()
+        fakerun_setup(stdout="\n")                      # for which_docker()
+        fakerun_setup(stdout="MainPID=%d\n" % mypid)
+        docker_daemon.cmdline = lambda _: ['/usr/bin/dockerd', '--foo']
+        expect = '%d:%d' % (mypid, docker_daemon.start_time(mypid))
+        self.assertEqual(docker_daemon.fingerprint(), expect)
+
+
+class TestDaemonCache(DDTestBase):
+    """
+    Tests for caching of discovered daemon details
+    """
+
+    def test_cached(self):
+        import os
+        import docker_daemon
+        mypid = os.getpid()
+        fakerun_setup(stdout="docker-latest.service loaded active running "
+                             "Docker\n")
+        fakerun_setup(stdout="MainPID=%d\n" % mypid)
+        docker_daemon.cmdline = lambda _: ['/usr/bin/dockerd', '--foo']
+        self.assertEqual(docker_daemon.pid(), mypid)
+        # No further utils.run() calls
+        self.assertEqual(docker_daemon.which_docker(), 'docker-latest')
+        self.assertEqual(docker_daemon.pid(), mypid)
+        self.assertEqual(FAKERUN_RESULTS, [])
+
+    def test_revalidate(self):
+        import docker_daemon
+        docker_daemon._DAEMON.update({'service': 'docker-latest',
+                                      'pid': 1, 'start_time': -1})
+        # Start time doesn't match, pid forgotten but service remembered
+        self.assertEqual(docker_daemon.which_docker(), 'docker-latest')
+        self.assertFalse('pid' in docker_daemon._DAEMON)
+
+    def test_proc_cmdline(self):
+        import os
+        import sys
+        import docker_daemon
+        self.assertTrue(sys.argv[0] in docker_daemon.cmdline(os.getpid()))
+
+    def test_output_cache(self):
+        from dockertest.output import DaemonCache
+        for action in (self.dd.stop, self.dd.start, self.dd.restart):
+            self.dd._DAEMON.update({'service': 'docker', 'main_pid': 1})
+            DaemonCache._fingerprint = '1:1'
+            DaemonCache._entries = {'docker info': 'Containers: 1'}
+            fakerun_setup(command='systemctl')
+            if action is self.dd.stop:
+                action()
+            else:
+                action(ready_timeout=None)
+            self.assertEqual(DaemonCache._fingerprint, None)
+            self.assertEqual(DaemonCache._entries, None)
+            self.assertEqual(self.dd._DAEMON, {'service': 'docker'})
+
+
+class TestWaitReady(DDTestBase):
+    """
+    Tests for ping() and wait_ready() against a stand-in daemon socket
+    """
+
+    def setUp(self):
+        import os
+        import tempfile
+        import threading
+        import BaseHTTPServer
+        import SocketServer
+        super(TestWaitReady, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.uri = os.path.join(self.tmpdir, 'docker.sock')
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if self.path in ('/_ping', '/containers/foo/json'):
+                    code, body = 200, 'OK'
+                else:
+                    code, body = 404, 'Not found'
+                self.send_response(code)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path == '/containers/foo/kill?signal=10':
+                    code = 204
+                else:
+                    code = 404
+                self.send_response(code)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass  # Unix socket client_address breaks default
+
+        class Server(SocketServer.ThreadingMixIn,
+                     SocketServer.UnixStreamServer):
+            daemon_threads = True
+
+        self.server = Server(self.uri, Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+
+    def tearDown(self):
+        import shutil
+        if self.thread.is_alive():
+            self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir)
+        super(TestWaitReady, self).tearDown()
+
+    def test_not_listening(self):
+        self.assertFalse(self.dd.ping(self.uri + '_nonexisting'))
+        self.assertRaises(RuntimeError, self.dd.wait_ready, 0.05,
+                          uri=self.uri + '_nonexisting')
+
+    def test_ready(self):
+        self.thread.start()
+        self.assertTrue(self.dd.ping(self.uri))
+        self.assertTrue(self.dd.wait_ready(1, ['foo'], self.uri) < 1)
+
+    def test_missing_container(self):
+        self.thread.start()
+        self.assertFalse(self.dd.ping(self.uri, ['foo', 'bar']))
+        self.assertRaises(RuntimeError, self.dd.wait_ready, 0.05,
+                          ['bar'], self.uri)
+
+    def test_post(self):
+        self.thread.start()
+        client = self.dd.SocketClient(self.uri)
+        try:
+            for path, status in (('/containers/foo/kill?signal=10', 204),
+                                 ('/containers/bar/kill?signal=10', 404)):
+                response = client.post(path)
+                response.read()
+                self.assertEqual(response.status, status)
+        finally:
+            client.close()
+
+
 if __name__ == '__main__':
     unittest2.main()
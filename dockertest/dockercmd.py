@@ -281,12 +281,34 @@ class DockerCmd(DockerCmdBase):  # pylint: disable=R0903
             str_stdin = ""
         if self.verbose:
             self.subtest.logdebug("Executing %s%s", str(self), str_stdin)
+        start = time.time()
         self.cmdresult = utils.run(self.command, timeout=self.timeout,
                                    stdin=stdin, verbose=False,
                                    ignore_status=True)
+        self.record_time(start)
         # Return value, not reference
         return self.cmdresult
 
+    def record_time(self, start):
+        """
+        Append timing details to subtest's ``command_times`` (if any)
+
+        :param start: Epoch seconds when command was started
+        """
+        if self.subtest.command_times is None:
+            return  # Not a fully initialized SubBase
+        # subcmd may be a fully-formed option/argument string
+        subcmd = self.subcmd.split()
+        if subcmd:
+            subcmd = subcmd[0]
+        else:
+            subcmd = ''
+        # list.append() is atomic, sub-subtests may be running in threads
+        self.subtest.command_times.append({'command': subcmd,
+                                           'start': start,
+                                           'duration': self.duration,
+                                           'exit_status': self.exit_status})
+
 
 class AsyncDockerCmd(DockerCmdBase):
 
@@ -278,6 +278,17 @@ class DockerCmdTestBasic(DockerCmdTestBase):
         self.assertAlmostEqual(cmdresult.duration, 123)
         # pylint: enable=E1101
 
+    def test_command_times(self):
+        self.fake_subtest.command_times = []
+        self.dockercmd.DockerCmd(self.fake_subtest,
+                                 'fake_subcommand --foo').execute()
+        self.dockercmd.DockerCmd(self.fake_subtest, 'unittest_fail').execute()
+        self.assertEqual([(record['command'], record['duration'],
+                           record['exit_status'])
+                          for record in self.fake_subtest.command_times],
+                         [('fake_subcommand', 123, 0),
+                          ('unittest_fail', 123, 1)])
+
     def test_no_fail_docker_cmd(self):
         docker_command = self.dockercmd.DockerCmd(self.fake_subtest,
                                                   'fake_subcommand')
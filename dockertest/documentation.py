@@ -13,7 +13,13 @@ is assumed.
 # pylint: disable=W0403
 
 import ast
+import hashlib
+import json
+import multiprocessing
 import os.path
+import pickle
+import tempfile
+import docdeps
 from docdeps import ConfigINIParser
 from docdeps import SummaryVisitor
 from docdeps import DocBase
@@ -114,9 +120,31 @@ class ConfigDoc(DocBase):
     #: Default base-path to use for all methods requiring one.
     default_base_path = '.'  # important for unittesting!
 
+    # Private cache of absolute ini path to (stamp, ConfigINIParser instance)
+    _parsed = {}
+
     def __init__(self, ini_path):
         self.ini_path = ini_path
-        self.docitems = ConfigINIParser(self.ini_path)
+        self.docitems = self.parse(self.ini_path)
+
+    @staticmethod
+    def parse(ini_path):
+        """
+        Return ``ConfigINIParser`` for ``ini_path``, re-using any previous
+        result if the file hasn't changed since.
+
+        :param ini_path: Full or absolute path to a ``.ini`` file
+        """
+        ini_path = os.path.abspath(ini_path)
+        stat = os.stat(ini_path)
+        # Parsing depends on undocumented option string
+        stamp = (stat.st_mtime, stat.st_size,
+                 ConfigINIParser.undoc_option_doc)
+        cached = ConfigDoc._parsed.get(ini_path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, ConfigINIParser(ini_path))
+            ConfigDoc._parsed[ini_path] = cached
+        return cached[1]
 
     @classmethod
     def new_by_name(cls, name, base_path=None):
@@ -132,13 +160,29 @@ class ConfigDoc(DocBase):
         """
         if base_path is None:
             base_path = cls.default_base_path
-        # If this becomes performance bottleneck, implement cls._cache
+        ini_path = cls.ini_by_name(name, base_path)
+        if ini_path is None:
+            raise ValueError("Subtest %s not found under %s/config_defaults"
+                             % (name, os.path.abspath(base_path)))
+        return cls(ini_path)
+
+    @classmethod
+    def ini_by_name(cls, name, base_path=None):
+        """
+        Return absolute path to ini file for subtest ``name`` or None
+
+        :param name: Subtest name (NOT sub-subtest names!)
+        :param base_path: Relative/Absolute path where ``config_defaults``
+                          directory can be found. Uses
+                          ``cls.default_base_path`` if None.
+        """
+        if base_path is None:
+            base_path = cls.default_base_path
+        # Unchanged files are only parsed once, see parse()
         for ini_path in cls.ini_filenames(base_path):
-            inst = cls(ini_path)
-            if name.strip() == inst.docitems.subtest_name:
-                return inst
-        raise ValueError("Subtest %s not found under %s/config_defaults"
-                         % (name, os.path.abspath(base_path)))
+            if name.strip() == cls.parse(ini_path).subtest_name:
+                return ini_path
+        return None
 
     @property
     def fmt(self):
@@ -463,6 +507,18 @@ class SubtestDocs(DocBase):
     #: Default contents block to include before all other sections
     contents = ".. contents::\n   :depth: 1\n   :local:\n\n"
 
+    #: Cache of rendered documentation, relative to ``base_path``.  Only
+    #: subtests whose module, ini, or defaults file changed are re-rendered.
+    #: None disables caching.
+    cache_filename = os.path.join('docs_build', 'subtest_docs_cache.json')
+
+    #: Format version of cache file, increment when it changes
+    cache_version = 1
+
+    #: Maximum number of processes rendering uncached documentation
+    #: concurrently, None for one per CPU.
+    processes = None
+
     def __init__(self, base_path=None, exclude=None, subtestdocclass=None,
                  contents=True):
         if not contents:
@@ -493,13 +549,145 @@ class SubtestDocs(DocBase):
         """Dynamically represent ``DocBase.sub_str`` when referenced
 
         Any test names referenced in ``exclude`` will be skipped"""
-        # list of tuples for initializing dictionary
-        lot = []
-        for name, filename in self.names_filenames.iteritems():
-            if name not in self.exclude:
-                lot.append((name, self.stdc(filename)))
+        names_filenames = dict([(name, filename)
+                                for name, filename
+                                in self.names_filenames.iteritems()
+                                if name not in self.exclude])
+        cache = self.load_cache()
+        digests = {}
+        result = {}
+        for name, filename in names_filenames.iteritems():
+            digests[name] = self.digest(name, filename)
+            entry = cache.get(self.cache_key(name))
+            if entry is not None and entry.get('digest') == digests[name]:
+                result[name] = entry['text'].encode('utf-8')
+        missing = sorted(set(names_filenames) - set(result))
+        rendered = self.render([names_filenames[name] for name in missing])
+        for name, text in zip(missing, rendered):
+            result[name] = text
+            try:
+                cache[self.cache_key(name)] = {'digest': digests[name],
+                                               'text': text.decode('utf-8')}
+            except UnicodeDecodeError:
+                pass  # Not representable in JSON, always re-render
+        if missing:
+            self.store_cache(cache)
         # Excluded names not present in ``fmt`` will be ignored
-        return dict(lot)
+        return result
+
+    def render(self, filenames):
+        """
+        Return list of rendered ``self.stdc`` strings for each filename,
+        concurrently in up to ``processes`` processes when possible.
+
+        :param filenames: List of absolute subtest module filenames
+        """
+        processes = self.processes
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = min(processes, len(filenames))
+        args = [(self.stdc, filename) for filename in filenames]
+        try:
+            # Classes defined inside functions can't be sent to workers
+            pickle.dumps(self.stdc)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            processes = 1
+        if processes > 1:
+            try:
+                pool = multiprocessing.Pool(processes)
+            except OSError:  # e.g. no /dev/shm
+                pass
+            else:
+                try:
+                    return pool.map(_render_subtest_doc, args)
+                finally:
+                    pool.terminate()
+                    pool.join()
+        return [_render_subtest_doc(arg) for arg in args]
+
+    def cache_key(self, name):
+        """
+        Return key identifying rendered output of subtest ``name`` in cache
+        """
+        return '%s.%s:%s' % (self.stdc.__module__, self.stdc.__name__, name)
+
+    def digest(self, name, filename):
+        """
+        Return hash of all inputs to rendering subtest ``name`` documentation
+
+        :param name: Standardized subtest name
+        :param filename: Absolute path to subtest module
+        """
+        digest = hashlib.sha1()
+        # Formatting depends on these class attributes
+        config_doc_class = self.stdc.ConfigDocClass
+        digest.update(repr((self.cache_key(name),
+                            self.stdc.fmt,
+                            self.stdc.NoINIString,
+                            self.stdc.name_postfix,
+                            getattr(config_doc_class, '__name__', None),
+                            ConfigDoc.item_fmt,
+                            ConfigDoc.def_item_fmt,
+                            ConfigDoc.inherit_fmt,
+                            ConfigINIParser.undoc_option_doc)))
+        ini_path = None
+        if config_doc_class is not None:
+            ini_path = config_doc_class.ini_by_name(name)
+        defaults = os.path.join(ConfigDoc.default_base_path,
+                                'config_defaults', 'defaults.ini')
+        # Changes to this module or docdeps must also invalidate cache
+        for path in (filename, ini_path, defaults,
+                     _source_filename(__file__),
+                     _source_filename(docdeps.__file__)):
+            digest.update('\0%s\0' % path)
+            try:
+                digest.update(open(path, 'rb').read())
+            except (IOError, TypeError):  # Missing or None
+                pass
+        return digest.hexdigest()
+
+    @property
+    def cache_path(self):
+        """
+        Absolute path to cache of rendered subtest documentation, or None
+        """
+        if self.cache_filename is None:
+            return None
+        return os.path.join(self.base_path, self.cache_filename)
+
+    def load_cache(self):
+        """
+        Return dictionary of cache keys to digest and rendered text
+        """
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, 'rb') as cache_file:
+                cache = json.load(cache_file)
+        except (IOError, ValueError):
+            return {}
+        if (not isinstance(cache, dict) or
+                cache.get('version') != self.cache_version):
+            return {}
+        return cache.get('entries', {})
+
+    def store_cache(self, entries):
+        """
+        Atomically replace cache with ``entries``, errors are ignored
+        """
+        if self.cache_path is None:
+            return
+        cache_dir = os.path.dirname(self.cache_path)
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            (fdes, temp_path) = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fdes, 'wb') as cache_file:
+                json.dump({'version': self.cache_version,
+                           'entries': entries}, cache_file)
+            os.rename(temp_path, self.cache_path)
+        except (IOError, OSError):
+            pass  # Only slower next time
 
     @property
     def names_filenames(self):
@@ -513,6 +701,21 @@ class SubtestDocs(DocBase):
         return dict(lot)
 
 
+def _source_filename(module_filename):
+    """Return ``.py`` filename for possibly compiled ``module_filename``"""
+    return os.path.splitext(os.path.abspath(module_filename))[0] + '.py'
+
+
+def _render_subtest_doc(stdc_filename):
+    """
+    Return ``str()`` of ``SubtestDoc`` (sub)class instance for filename
+
+    :param stdc_filename: Tuple of ``SubtestDoc`` (sub)class and filename
+    """
+    stdc, filename = stdc_filename
+    return str(stdc(filename))
+
+
 def set_default_base_path(base_path):
     """Modify all relevant classes ``default_base_path`` to base_path"""
     # Order is significant!
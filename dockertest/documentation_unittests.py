@@ -643,5 +643,36 @@ class TestSubtestDocs(DocumentationTestBase):
         has_baz = stds.find('Some Content')
         self.assertEqual(has_baz, -1)
 
+    def test_cache(self):
+        rendered = []
+
+        class MySDS(self.stds):
+
+            def render(self, filenames):
+                rendered.extend(self.stdc.name(filename)
+                                for filename in filenames)
+                return super(MySDS, self).render(filenames)
+
+        first = str(MySDS(self.tmpdir))
+        self.assertEqual(sorted(rendered), ['bar', 'baz', 'foo'])
+        self.assertTrue(os.path.isfile(MySDS(self.tmpdir).cache_path))
+        del rendered[:]
+        self.assertEqual(str(MySDS(self.tmpdir)), first)
+        self.assertEqual(rendered, [])
+        subtest = open(self.subtest_fullpath('bar'), 'wb')
+        subtest.write('"""**654321**"""\n')
+        subtest.close()
+        second = str(MySDS(self.tmpdir))
+        self.assertEqual(rendered, ['bar'])
+        self.assertTrue(second.find('654321') > -1)
+        self.assertTrue(second.find('Some Content') > -1)
+
+    def test_render_serial(self):
+        stds = self.stds(self.tmpdir)
+        stds.processes = 1
+        stds.cache_filename = None
+        serial = str(stds)
+        self.assertEqual(str(self.stds(self.tmpdir)), serial)
+
 if __name__ == '__main__':
     unittest.main()
@@ -7,6 +7,8 @@ Low-level/standalone host-environment handling/checking utilities/classes/data
        in autotest!
 """
 
+import os
+import os.path
 import warnings
 import subprocess
 # N/B: This module is automaticly generated from libselinux, so the
@@ -16,9 +18,37 @@ import selinux
 from dockertest.docker_daemon import which_docker
 
 
+#: Private cache of values which can't change while running (do not use)
+_CACHE = {}
+
+
+def selinux_is_enabled():
+    """
+    Return (cached) True if selinux is supported and enabled on this host.
+
+    :rtype: bool
+    """
+    if 'enabled' not in _CACHE:
+        _CACHE['enabled'] = selinux.is_selinux_enabled() == 1
+    return _CACHE['enabled']
+
+
+def _set_context_type(path, context, getfilecon, setfilecon):
+    """
+    Replace type component of path's context with context, if different.
+    """
+    old_context = getfilecon(path)[1]
+    # user:role:type:level, level may contain ':' too
+    fields = old_context.split(':')
+    fields[2] = context
+    new_context = ':'.join(fields)
+    if new_context != old_context:
+        setfilecon(path, new_context)
+
+
 def set_selinux_context(path=None, context=None, recursive=True, pwd=None):
     """
-    When selinux is enabled it sets the context by chcon -t ...
+    When selinux is enabled it sets the type of the context, like chcon -t
     :param path: Relative/absolute path to file/directory to modify
     :param context: desired context (svirt_sandbox_file_t by default)
     :param recursive: set context recursively (-R)
@@ -39,21 +69,29 @@ def set_selinux_context(path=None, context=None, recursive=True, pwd=None):
         raise TypeError("The path argument is required")
     if context is None:
         context = "svirt_sandbox_file_t"
-    if recursive:
-        flags = 'R'
-    else:
-        flags = ''
     # changes context in case selinux is supported and is enabled
-    _cmd = ("type -P selinuxenabled || exit 0 ; "
-            "selinuxenabled || exit 0 ; "
-            "chcon -%st %s %s" % (flags, context, path))
-    # FIXME: Should use selinux.setfilecon()
-    cmd = subprocess.Popen(_cmd, stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE, shell=True)
-    if cmd.wait() != 0:
-        raise OSError("Fail to set selinux context by '%s' (%s):\nSTDOUT:\n%s"
-                      "\nSTDERR:\n%s" % (_cmd, cmd.poll(), cmd.stdout.read(),
-                                         cmd.stderr.read()))
+    if not selinux_is_enabled():
+        return
+    current = path
+    try:
+        # Same as chcon: follow path itself, but never symlinks beneath it
+        _set_context_type(path, context,
+                          selinux.getfilecon, selinux.setfilecon)
+        if not recursive or not os.path.isdir(path):
+            return
+
+        def _raise(xcept):
+            raise xcept
+
+        # Symlinks to directories are listed in dirnames, but not followed
+        for dirpath, dirnames, filenames in os.walk(path, onerror=_raise):
+            for name in dirnames + filenames:
+                current = os.path.join(dirpath, name)
+                _set_context_type(current, context,
+                                  selinux.lgetfilecon, selinux.lsetfilecon)
+    except OSError, xcept:
+        raise OSError(xcept.errno, "Fail to set selinux context type %s on"
+                      " '%s': %s" % (context, current, xcept.strerror))
 
 
 def get_selinux_context(path):
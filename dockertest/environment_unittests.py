@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+# Pylint runs from a different directory, it's fine to import this way
+# pylint: disable=W0403
+
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+
+# DO NOT allow this function to get loose in the wild!
+def mock(mod_path):
+    """
+    Recursively inject tree of mocked modules from entire mod_path
+    """
+    name_list = mod_path.split('.')
+    child_name = name_list.pop()
+    child_mod = sys.modules.get(mod_path, types.ModuleType(child_name))
+    if len(name_list) == 0:  # child_name is left-most basic module
+        if child_name not in sys.modules:
+            sys.modules[child_name] = child_mod
+        return sys.modules[child_name]
+    else:
+        # New or existing child becomes parent
+        recurse_path = ".".join(name_list)
+        parent_mod = mock(recurse_path)
+        if not hasattr(sys.modules[recurse_path], child_name):
+            setattr(parent_mod, child_name, child_mod)
+            # full-name also points at child module
+            sys.modules[mod_path] = child_mod
+        return sys.modules[mod_path]
+
+
+class FakeSelinux(types.ModuleType):
+
+    """Records contexts in a dict instead of file extended attributes"""
+
+    default = 'system_u:object_r:user_tmp_t:s0:c1,c2'
+
+    def __init__(self):
+        super(FakeSelinux, self).__init__('selinux')
+        self.enabled = 1
+        self.contexts = {}
+        self.calls = []
+        self.fail_on = None
+
+    def is_selinux_enabled(self):
+        return self.enabled
+
+    def _path(self, path, follow):
+        if follow:
+            path = os.path.realpath(path)
+        if not os.path.lexists(path):
+            raise OSError(2, "No such file or directory")
+        return path
+
+    def _get(self, path, follow):
+        context = self.contexts.get(self._path(path, follow), self.default)
+        return [len(context) + 1, context]
+
+    def _set(self, path, context, follow):
+        self.calls.append((path, follow))
+        if path == self.fail_on:
+            raise OSError(95, "Operation not supported")
+        self.contexts[self._path(path, follow)] = context
+
+    def getfilecon(self, path):
+        return self._get(path, True)
+
+    def lgetfilecon(self, path):
+        return self._get(path, False)
+
+    def setfilecon(self, path, context):
+        self._set(path, context, True)
+
+    def lsetfilecon(self, path, context):
+        self._set(path, context, False)
+
+
+sys.modules['selinux'] = FakeSelinux()
+# Avoids import error
+mock('autotest.client.utils')
+
+
+class TestSetSelinuxContext(unittest.TestCase):
+
+    expected = 'system_u:object_r:svirt_sandbox_file_t:s0:c1,c2'
+
+    def setUp(self):
+        import environment
+        self.environment = environment
+        self.environment._CACHE.clear()
+        self.selinux = sys.modules['selinux']
+        self.selinux.__init__()
+        self.tmpdir = tempfile.mkdtemp()
+        self.outside = tempfile.mkdtemp()
+        self.top = os.path.join(self.tmpdir, 'top')
+        os.makedirs(os.path.join(self.top, 'sub', 'deeper'))
+        for name in ('file', 'sub/file', 'sub/deeper/file'):
+            open(os.path.join(self.top, name), 'wb').close()
+        os.symlink(self.outside, os.path.join(self.top, 'sub', 'link'))
+
+    def tearDown(self):
+        self.environment._CACHE.clear()
+        shutil.rmtree(self.tmpdir)
+        shutil.rmtree(self.outside)
+
+    def context_of(self, *names):
+        return self.selinux.contexts.get(os.path.join(self.top, *names))
+
+    def test_recursive(self):
+        self.environment.set_selinux_context(self.top)
+        for names in ([], ['file'], ['sub'], ['sub', 'file'], ['sub', 'link'],
+                      ['sub', 'deeper'], ['sub', 'deeper', 'file']):
+            self.assertEqual(self.context_of(*names), self.expected)
+        # Symlink itself, not the directory it points at
+        self.assertFalse(self.outside in self.selinux.contexts)
+        # Only the top is followed
+        self.assertEqual([follow for _, follow in self.selinux.calls],
+                         [True] + [False] * 6)
+
+    def test_unchanged(self):
+        self.environment.set_selinux_context(self.top)
+        del self.selinux.calls[:]
+        self.environment.set_selinux_context(self.top)
+        self.assertEqual(self.selinux.calls, [])
+
+    def test_non_recursive(self):
+        self.environment.set_selinux_context(self.top, 'foo_t',
+                                             recursive=False)
+        self.assertEqual(self.selinux.contexts,
+                         {self.top: 'system_u:object_r:foo_t:s0:c1,c2'})
+        filename = os.path.join(self.top, 'file')
+        self.environment.set_selinux_context(filename)
+        self.assertEqual(self.context_of('file'), self.expected)
+        self.assertEqual(len(self.selinux.contexts), 2)
+
+    def test_disabled(self):
+        self.selinux.enabled = 0
+        self.environment.set_selinux_context(self.top)
+        self.assertEqual(self.selinux.calls, [])
+        # Doesn't check for existence either
+        self.environment.set_selinux_context('/does/not/exist')
+
+    def test_failure(self):
+        self.selinux.fail_on = os.path.join(self.top, 'sub', 'file')
+        try:
+            self.environment.set_selinux_context(self.top)
+        except OSError, xcept:
+            self.assertEqual(xcept.errno, 95)
+            self.assertTrue(self.selinux.fail_on in xcept.strerror)
+        else:
+            self.fail("OSError not raised")
+        self.assertRaises(OSError, self.environment.set_selinux_context,
+                          os.path.join(self.tmpdir, 'missing'))
+
+    def test_path_required(self):
+        self.assertRaises(TypeError, self.environment.set_selinux_context)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Detect and remove containers and images left behind by a single test.
+
+A ``LeakCheck`` instance records the set of all container and image IDs
+when created.  Later, any IDs not in that set, and not configured to be
+preserved, were created by the test in-between.  This only requires two
+``--quiet`` listings per snapshot, so it's cheap enough to run around
+every subtest.
+"""
+
+# Pylint runs from another directory, ignore relative import warnings
+# pylint: disable=W0403
+
+from autotest.client import utils
+from autotest.client.shared.error import CmdError
+from config import get_as_list
+from images import DockerImage
+
+
+class LeakCheck(object):
+
+    """
+    Snapshot of container and image IDs, compared with a later snapshot.
+
+    :param subtest: A subtest.SubBase subclass instance
+    :raises CmdError: If docker commands fail (e.g. daemon not running)
+    """
+
+    #: Set of all container IDs at time of instance creation
+    containers = None
+
+    #: Set of all image IDs at time of instance creation
+    images = None
+
+    def __init__(self, subtest):
+        self.subtest = subtest
+        self.containers, self.images = self.snapshot()
+
+    def docker(self, subcmd, ignore_status=False):
+        """
+        Run docker subcommand quietly, returning CmdResult instance
+
+        :param subcmd: Docker subcommand and arguments string
+        :param ignore_status: When True, don't raise on non-zero exit
+        :return: autotest.client.utils.CmdResult instance
+        """
+        command = "%s %s" % (self.subtest.config['docker_path'], subcmd)
+        return utils.run(command, ignore_status=ignore_status,
+                         verbose=False,
+                         timeout=float(self.subtest.config['docker_timeout']))
+
+    def snapshot(self):
+        """
+        Return tuple of current container IDs set and image IDs set
+        """
+        containers = self.docker("ps --all --quiet --no-trunc").stdout
+        # Multiple tags for same image print same ID
+        images = self.docker("images --quiet --no-trunc").stdout
+        return (set(containers.split()), set(images.split()))
+
+    def preserved(self):
+        """
+        Return set of IDs for ``preserve_cnames``, ``preserve_fqins``,
+        and default image.
+        """
+        config = self.subtest.config
+        names = get_as_list(config.get('preserve_cnames', ''))
+        names += get_as_list(config.get('preserve_fqins', ''))
+        names.append(DockerImage.full_name_from_defaults(config))
+        names = [name for name in names if name]
+        # Missing names cause non-zero exit, existing IDs are still printed
+        result = self.docker("inspect --format '{{.Id}}' %s"
+                             % " ".join(names), ignore_status=True)
+        return set(result.stdout.split())
+
+    def leaks(self):
+        """
+        Return tuple of container and image ID sets created since
+        instance creation, excluding any preserved.
+        """
+        containers, images = self.snapshot()
+        containers -= self.containers
+        images -= self.images
+        # Only pay for lookup when needed
+        if containers or images:
+            preserved = self.preserved()
+            containers -= preserved
+            images -= preserved
+        return (containers, images)
+
+    def remove(self, containers, images):
+        """
+        Forcibly remove containers (and their volumes), then images.
+
+        :param containers: Iterable of container IDs to remove
+        :param images: Iterable of image IDs to remove
+        :return: Same as ``leaks()``, i.e. what could not be removed
+        """
+        # Failures are reported by the caller from returned leaks
+        if containers:
+            self.docker("rm --force --volumes %s"
+                        % " ".join(sorted(containers)), ignore_status=True)
+        if images:
+            self.docker("rmi --force %s"
+                        % " ".join(sorted(images)), ignore_status=True)
+        return self.leaks()
+
+    def report(self):
+        """
+        Remove (if ``remove_after_test``) and log leaked containers/images
+
+        :return: Description of remaining leaks, or empty string if none
+        """
+        try:
+            containers, images = self.leaks()
+            if ((containers or images) and
+                    self.subtest.config['remove_after_test']):
+                self.subtest.logdebug("Removing leaked containers %s and "
+                                      "images %s", list(containers),
+                                      list(images))
+                containers, images = self.remove(containers, images)
+        except (CmdError, OSError), xcept:
+            self.subtest.logwarning("Unable to check for leaks: %s", xcept)
+            return ''
+        if not containers and not images:
+            return ''
+        self.subtest.write_test_keyval({
+            'leaked_containers': ",".join(containers),
+            'leaked_images': ",".join(images)})
+        leaks = ("Test left behind containers %s and images %s"
+                 % (list(containers), list(images)))
+        self.subtest.logwarning(leaks)
+        return leaks
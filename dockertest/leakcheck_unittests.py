@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+# Pylint runs from a different directory, it's fine to import this way
+# pylint: disable=W0403
+
+import sys
+import types
+import unittest2
+
+
+def mock(mod_path):
+    name_list = mod_path.split('.')
+    child_name = name_list.pop()
+    child_mod = sys.modules.get(mod_path, types.ModuleType(child_name))
+    if len(name_list) == 0:  # child_name is left-most basic module
+        if child_name not in sys.modules:
+            sys.modules[child_name] = child_mod
+        return sys.modules[child_name]
+    else:
+        # New or existing child becomes parent
+        recurse_path = ".".join(name_list)
+        parent_mod = mock(recurse_path)
+        if not hasattr(sys.modules[recurse_path], child_name):
+            setattr(parent_mod, child_name, child_mod)
+            # full-name also points at child module
+            sys.modules[mod_path] = child_mod
+        return sys.modules[mod_path]
+
+
+class FakeCmdResult(object):
+
+    def __init__(self, **dargs):
+        for key, val in dargs.items():
+            setattr(self, key, val)
+
+
+# Simulated docker daemon state, and commands run against it
+CONTAINERS = set()
+IMAGES = set()
+NAMES = {}
+COMMANDS = []
+
+
+def run(command, *_args, **_dargs):
+    COMMANDS.append(command)
+    args = command.split()[1:]
+    stdout = ''
+    if args[0] == 'ps':
+        stdout = "\n".join(CONTAINERS)
+    elif args[0] == 'images':
+        stdout = "\n".join(IMAGES)
+    elif args[0] == 'inspect':
+        stdout = "\n".join(NAMES[name] for name in args[3:]
+                           if name in NAMES)
+    elif args[0] == 'rm':
+        CONTAINERS.difference_update(args[3:])
+    elif args[0] == 'rmi':
+        IMAGES.difference_update(args[2:])
+    return FakeCmdResult(command=command, stdout=stdout, stderr='',
+                         exit_status=0, duration=0)
+
+setattr(mock('autotest.client.utils'), 'run', run)
+setattr(mock('autotest.client.shared.error'), 'CmdError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestFail', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestNAError', Exception)
+setattr(mock('autotest.client.shared.error'), 'AutotestError', Exception)
+mock('autotest.client.shared.utils')
+
+
+class FakeSubtest(object):
+
+    config = {'docker_path': '/usr/bin/docker',
+              'docker_timeout': 60.0,
+              'docker_registry_host': '',
+              'docker_registry_user': '',
+              'docker_repo_name': 'fedora',
+              'docker_repo_tag': 'latest',
+              'preserve_fqins': 'foo/bar:baz',
+              'preserve_cnames': 'keepme',
+              'remove_after_test': True}
+
+    def __init__(self):
+        self.keyvals = {}
+        self.warnings = []
+
+    def write_test_keyval(self, keyvals):
+        self.keyvals.update(keyvals)
+
+    def logdebug(self, *args):
+        pass
+
+    def logwarning(self, message, *args):
+        self.warnings.append(message % args)
+
+
+class TestLeakCheck(unittest2.TestCase):
+
+    def setUp(self):
+        import leakcheck
+        CONTAINERS.clear()
+        CONTAINERS.update(['c1', 'c2'])
+        IMAGES.clear()
+        IMAGES.update(['sha256:i1'])
+        NAMES.clear()
+        NAMES.update({'keepme': 'c4', 'fedora:latest': 'sha256:i3'})
+        del COMMANDS[:]
+        self.leak_check = leakcheck.LeakCheck(FakeSubtest())
+
+    def test_no_leaks(self):
+        self.assertEqual(self.leak_check.leaks(), (set(), set()))
+        # Preserved items not looked up when unnecessary
+        self.assertEqual(len(COMMANDS), 4)
+
+    def test_leaks(self):
+        CONTAINERS.update(['c3', 'c4'])
+        IMAGES.update(['sha256:i2', 'sha256:i3'])
+        CONTAINERS.discard('c1')
+        self.assertEqual(self.leak_check.leaks(),
+                         (set(['c3']), set(['sha256:i2'])))
+
+    def test_remove(self):
+        CONTAINERS.update(['c3', 'c4'])
+        IMAGES.update(['sha256:i2', 'sha256:i3'])
+        self.assertEqual(self.leak_check.remove(['c3'], ['sha256:i2']),
+                         (set(), set()))
+        self.assertEqual(CONTAINERS, set(['c1', 'c2', 'c4']))
+        self.assertEqual(IMAGES, set(['sha256:i1', 'sha256:i3']))
+
+    def test_report_removed(self):
+        CONTAINERS.update(['c3'])
+        self.assertEqual(self.leak_check.report(), '')
+        self.assertEqual(CONTAINERS, set(['c1', 'c2']))
+        self.assertEqual(self.leak_check.subtest.keyvals, {})
+
+    def test_report_remaining(self):
+        self.leak_check.subtest.config = dict(FakeSubtest.config,
+                                              remove_after_test=False)
+        IMAGES.update(['sha256:i2'])
+        leaks = self.leak_check.report()
+        self.assertTrue('sha256:i2' in leaks)
+        self.assertEqual(self.leak_check.subtest.warnings, [leaks])
+        self.assertEqual(self.leak_check.subtest.keyvals,
+                         {'leaked_containers': '',
+                          'leaked_images': 'sha256:i2'})
+        self.assertEqual(IMAGES, set(['sha256:i1', 'sha256:i2']))
+
+
+if __name__ == '__main__':
+    unittest2.main()
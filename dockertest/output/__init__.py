@@ -5,7 +5,9 @@ allows existing clients to continue importing as a single unit.
 """
 
 from . dockertime import DockerTime
+from . daemoncache import DaemonCache
 from . dockerinfo import DockerInfo
+from . dockerevents import DockerEvents, parse_event, parse_events
 from . dockerversion import DockerVersion
 from . texttable import TextTable, ColumnRanges
 from . validate import OutputGood, OutputGoodBase, OutputNotBad
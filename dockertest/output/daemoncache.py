@@ -0,0 +1,123 @@
+"""
+Cache of docker command output, valid for the life of one daemon instance
+"""
+
+import json
+import logging
+import os
+import os.path
+import tempfile
+import dockertest.docker_daemon as docker_daemon
+
+
+class DaemonCache(object):
+
+    """
+    Process-wide cache of output strings, keyed by daemon fingerprint
+
+    Entries are shared with later subtest processes through a file in
+    ``cache_dir`` and discarded as soon as the daemon's PID/start-time
+    fingerprint changes.  Code that restarts the daemon *within* a
+    process must call ``invalidate()`` afterwards.
+    """
+
+    #: Directory to persist cache into (job results dir), ``None`` disables.
+    #: Set automatically by ``dockertest.subtest.Subtest``.
+    cache_dir = None
+
+    #: Name of the file stored in ``cache_dir``
+    filename = 'docker_daemon_cache.json'
+
+    #: Private in-process cache of daemon fingerprint (do not use)
+    _fingerprint = None
+
+    #: Private in-process cache of key to value (do not use)
+    _entries = None
+
+    @classmethod
+    def cache_path(cls):
+        """
+        Return full path to persistent cache file or None if disabled
+        """
+        if cls.cache_dir is None:
+            return None
+        return os.path.join(cls.cache_dir, cls.filename)
+
+    @classmethod
+    def fingerprint(cls):
+        """
+        Return (cached) fingerprint of running daemon, or None if unknown
+        """
+        if cls._fingerprint is None:
+            # Daemon may be remote, not under systemd, or not running at all
+            # pylint: disable=W0703
+            try:
+                cls._fingerprint = docker_daemon.fingerprint()
+            except Exception, xcept:
+                logging.debug("Not caching docker output, unable to "
+                              "fingerprint daemon: %s", xcept)
+                return None
+        return cls._fingerprint
+
+    @classmethod
+    def _load(cls, fingerprint):
+        entries = {}
+        path = cls.cache_path()
+        if path is None:
+            return entries
+        try:
+            with open(path, 'rb') as cachefile:
+                content = json.load(cachefile)
+            if content['fingerprint'] == fingerprint:
+                for key, value in content['entries'].items():
+                    entries[str(key)] = value.encode('utf-8')
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            pass  # Missing, unreadable, or stale: start over
+        return entries
+
+    @classmethod
+    def _store(cls, fingerprint):
+        path = cls.cache_path()
+        if path is None:
+            return
+        content = {'fingerprint': fingerprint, 'entries': cls._entries}
+        tmppath = None
+        try:
+            # Rename is atomic, readers never see a partial file
+            (fdes, tmppath) = tempfile.mkstemp(prefix=cls.filename,
+                                               dir=cls.cache_dir)
+            with os.fdopen(fdes, 'wb') as tmpfile:
+                json.dump(content, tmpfile)
+            os.rename(tmppath, path)
+        except (IOError, OSError), xcept:
+            logging.debug("Unable to write %s: %s", path, xcept)
+            # Don't leave partial files behind in results
+            if tmppath is not None and os.path.isfile(tmppath):
+                os.unlink(tmppath)
+
+    @classmethod
+    def get(cls, key, producer):
+        """
+        Return cached value for key, calling producer() to fill it on a miss
+
+        :param key: Unique string identifying the value (e.g. command line)
+        :param producer: Callable taking no arguments returning a string
+        :returns: String value from cache or ``producer()``
+        """
+        fingerprint = cls.fingerprint()
+        if fingerprint is None:
+            return producer()
+        if cls._entries is None:
+            cls._entries = cls._load(fingerprint)
+        if key not in cls._entries:
+            cls._entries[key] = producer()
+            cls._store(fingerprint)
+        return cls._entries[key]
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Forget all cached values, must be called after a daemon restart
+        """
+        cls._fingerprint = None
+        cls._entries = None
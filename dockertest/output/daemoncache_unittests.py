@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import sys
+import tempfile
+import types
+from unittest2 import TestCase, main
+
+
+# DO NOT allow this function to get loose in the wild!
+def mock(mod_path):
+    """
+    Recursively inject tree of mocked modules from entire mod_path
+    """
+    name_list = mod_path.split('.')
+    child_name = name_list.pop()
+    child_mod = sys.modules.get(mod_path, types.ModuleType(child_name))
+    if len(name_list) == 0:  # child_name is left-most basic module
+        if child_name not in sys.modules:
+            sys.modules[child_name] = child_mod
+        return sys.modules[child_name]
+    else:
+        # New or existing child becomes parent
+        recurse_path = ".".join(name_list)
+        parent_mod = mock(recurse_path)
+        if not hasattr(sys.modules[recurse_path], child_name):
+            setattr(parent_mod, child_name, child_mod)
+            # full-name also points at child module
+            sys.modules[mod_path] = child_mod
+        return sys.modules[mod_path]
+
+setattr(mock('autotest.client.shared.error'), 'AutotestError', Exception)
+setattr(mock('autotest.client.shared.error'), 'CmdError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestFail', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestNAError', Exception)
+setattr(mock('autotest.client.utils'), 'PlaceHolder', Exception)
+
+
+class TestDaemonCache(TestCase):
+
+    def setUp(self):
+        import dockertest.docker_daemon
+        from dockertest.output import DaemonCache
+        self.docker_daemon = dockertest.docker_daemon
+        self.orig_fingerprint = dockertest.docker_daemon.fingerprint
+        self.fingerprint = 'one'
+        self.docker_daemon.fingerprint = lambda: self.fingerprint
+        self.DaemonCache = DaemonCache
+        self.DaemonCache.cache_dir = tempfile.mkdtemp()
+        self.DaemonCache.invalidate()
+        self.calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.DaemonCache.cache_dir)
+        self.DaemonCache.cache_dir = None
+        self.DaemonCache.invalidate()
+        self.docker_daemon.fingerprint = self.orig_fingerprint
+
+    def producer(self):
+        self.calls += 1
+        return 'output %d' % self.calls
+
+    def test_in_process(self):
+        self.assertEqual(self.DaemonCache.get('foo', self.producer),
+                         'output 1')
+        self.assertEqual(self.DaemonCache.get('foo', self.producer),
+                         'output 1')
+        self.assertEqual(self.DaemonCache.get('bar', self.producer),
+                         'output 2')
+        self.assertEqual(self.calls, 2)
+
+    def test_persistent(self):
+        self.DaemonCache.get('foo', self.producer)
+        self.assertTrue(os.path.isfile(self.DaemonCache.cache_path()))
+        # Simulates a new process, same daemon
+        self.DaemonCache.invalidate()
+        self.assertEqual(self.DaemonCache.get('foo', self.producer),
+                         'output 1')
+        self.assertEqual(self.calls, 1)
+
+    def test_restarted(self):
+        self.DaemonCache.get('foo', self.producer)
+        self.fingerprint = 'two'
+        # Not noticed until invalidated
+        self.assertEqual(self.DaemonCache.get('foo', self.producer),
+                         'output 1')
+        self.DaemonCache.invalidate()
+        self.assertEqual(self.DaemonCache.get('foo', self.producer),
+                         'output 2')
+
+    def test_no_fingerprint(self):
+        def broken():
+            raise OSError("No daemon")
+        self.docker_daemon.fingerprint = broken
+        self.DaemonCache.get('foo', self.producer)
+        self.DaemonCache.get('foo', self.producer)
+        self.assertEqual(self.calls, 2)
+
+    def test_store_failure(self):
+        # rename() onto a directory fails
+        os.mkdir(self.DaemonCache.cache_path())
+        self.assertEqual(self.DaemonCache.get('foo', self.producer),
+                         'output 1')
+        self.assertEqual(os.listdir(self.DaemonCache.cache_dir),
+                         [self.DaemonCache.filename])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Parse ``docker events`` output into an indexed, de-duplicated store
+"""
+
+import re
+from bisect import bisect_right
+from collections import Mapping
+from dockertest.xceptions import DockerValueError
+from . dockertime import DockerTime
+
+
+#: Component regular expressions, used to build the per-format patterns below
+REGEXES = {
+    'timestamp': r'[\d-]+T[\d:]+\.\d+([+-][\d:]+|Z)',  # <iso8601>.<µs><TZ>
+                                                       # TZ='[+/-]HH:MM' or 'Z'
+    'cid':       r'(sha256:)?[0-9a-fA-F]{64}',         # 64-char hash
+    # Same as ``dockertest.images.DockerImage.repo_split_p`` (can't import
+    # it here, images module depends on this package).
+    'fqin':      (r"(?P<repo_addr>.+?"                 # eg some.repo/image:tag
+                  r"(?P<repo_addr_port>:[\d]+?)?/)?"
+                  r"(?P<user>[\w\-\.\+]+/)?"
+                  r"(?P<repo>[\w\-\.]+)"
+                  r"(?P<tag>:[\w\-\.]*)?"),
+    'operation': r'[\w-]+',                            # eg create, attach
+    'source':    r'\S+'                                # canonical image name
+}
+
+#: docker >= 1.10 format, eg <timestamp> container start <sha> (details)
+EVENT_110_RE = re.compile(r'^(?P<timestamp>{timestamp})'
+                          r'\s+(?P<object>\w+)'
+                          r'\s+(?P<operation>{operation})'
+                          r'\s+(?P<identifier>{cid}|{fqin})'
+                          r'\s+\((?P<rest>.*)\)'.format(**REGEXES))
+
+#: docker < 1.10 format, eg <timestamp> <sha> (from <source>) start
+EVENT_109_RE = re.compile(r'^(?P<timestamp>{timestamp})'
+                          r'\s+(?P<identifier>{cid}|{fqin}):'
+                          r'(\s+\(from (?P<source>{source})\))?'
+                          r'\s+(?P<operation>{operation})'.format(**REGEXES))
+
+#: Source image within parenthesized docker >= 1.10 details
+SOURCE_110_RE = re.compile(r'(^|\s)image=(?P<image>\S+)(,|$)')
+
+
+def parse_event_docker_110(line):
+    """
+    Try to parse input as a docker 1.10 event
+
+    :param line: String-like containing a single event line
+    :returns: {DETAILS} from parsing line or None if unparseable
+    """
+    mobj = EVENT_110_RE.match(line)
+    if mobj is None:
+        return None
+    # Matched! Extract the positional fields, then try looking for source img
+    details = {
+        'datetime':   DockerTime(mobj.group('timestamp')),
+        'identifier': mobj.group('identifier'),
+        'object':     mobj.group('object'),
+        'operation':  mobj.group('operation'),
+        'source':     None,
+    }
+    # TODO: (maybe): split out components of the parenthesized list.
+    # If so, keep in mind that you can't just split on commas (because
+    # of "Red Hat, Inc.") and that the fields are output in unpredictable
+    # order: even two consecutive event lines will have different ordering.
+    mobj2 = SOURCE_110_RE.search(mobj.group('rest'))
+    if mobj2 is not None:
+        details['source'] = mobj2.group('image')
+    return details
+
+
+def parse_event_docker_109(line):
+    """
+    Try to parse input as a docker < 1.10 event
+
+    :param line: String-like containing a single event line
+    :returns: {DETAILS} from parsing line or None if unparseable
+    """
+    mobj = EVENT_109_RE.match(line)
+    if mobj is None:
+        return None
+    return {
+        'datetime':   DockerTime(mobj.group('timestamp')),
+        'identifier': mobj.group('identifier'),
+        'source':     mobj.group('source'),
+        'operation':  mobj.group('operation'),
+    }
+
+
+def parse_event(line):
+    """
+    Return {DETAILS} from parsing line
+
+    :param line: String-like containing a single event line
+    :returns: {DETAILS} from parsing line or None if unparseable
+    """
+    details = parse_event_docker_110(line)
+    if details is None:
+        details = parse_event_docker_109(line)
+    return details
+
+
+def parse_events(lines, slop=None):
+    """
+    Return list of tuples for valid lines returned by parse_event()
+
+    :param lines: String containing events, one per line
+    :param slop: number of unparseable lines to tolerate, None/- to disable
+    :returns: List of tuple(CID, {DETAILS}) as returned from parse_event()
+    :raises DockerValueError: When more than ``slop`` lines are unparseable
+    """
+    sloppy = []
+    result = []
+    n_lines = 0
+    for line in lines.splitlines():
+        n_lines += 1
+        cid_details = parse_event(line)
+        if cid_details is not None:
+            result.append((cid_details['identifier'], cid_details))
+        else:
+            sloppy.append(line)
+        if slop is not None and slop >= 0:
+            n_slop = len(sloppy)
+            if n_slop > slop:
+                raise DockerValueError("Excess slop (>%d) encountered after "
+                                       "parsing (%d) events (success on %d). "
+                                       " Garbage: %s"
+                                       % (slop, n_lines, n_lines - n_slop,
+                                          sloppy))
+    return result
+
+
+class DockerEvents(Mapping):
+
+    """
+    Immutable-view map of CID or FQIN to de-duplicated, time-ordered events
+
+    :param events_list: Optional list of tuple(CID/FQIN, {DETAILS}) as
+                        returned from ``parse_events()``
+    """
+
+    # Mapping has no state to initialize
+    # pylint: disable=W0231
+
+    def __init__(self, events_list=None):
+        # CID/FQIN to list of {DETAILS}, ordered by datetime
+        self._events = {}
+        # CID/FQIN to parallel list of datetimes (bisect can't use a key)
+        self._times = {}
+        # Hashed (CID/FQIN, datetime, source, operation) of stored events
+        self._seen = set()
+        if events_list is not None:
+            self.extend(events_list)
+
+    def __getitem__(self, key):
+        return self._events[key]
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __contains__(self, key):
+        return key in self._events
+
+    def __str__(self):
+        return ("%s with %d events for %d identifiers"
+                % (self.__class__.__name__, len(self._seen), len(self)))
+
+    def add(self, _id, details):
+        """
+        Insert ``details`` in time-order for ``_id`` unless it's a duplicate
+
+        :param _id: CID or FQIN the event belongs to
+        :param details: {DETAILS} dictionary as returned from parse_event()
+        :returns: True if details were added, False if duplicate
+        """
+        when = details['datetime']
+        fingerprint = (_id, when, details['source'], details['operation'])
+        if fingerprint in self._seen:
+            return False
+        self._seen.add(fingerprint)
+        times = self._times.get(_id)
+        if times is None:
+            self._times[_id] = [when]
+            self._events[_id] = [details]
+            return True
+        # Equal times stay in insertion order, same as a stable sort
+        index = bisect_right(times, when)
+        times.insert(index, when)
+        self._events[_id].insert(index, details)
+        return True
+
+    def extend(self, events_list):
+        """
+        Add all events from events_list, skipping duplicates
+
+        :param events_list: List of tuple(CID/FQIN, {DETAILS}) as
+                            returned from ``parse_events()``
+        :returns: Number of (non-duplicate) events added
+        """
+        add = self.add
+        return sum(1 for _id, details in events_list if add(_id, details))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+import sys
+import types
+from unittest2 import TestCase, main
+
+
+# DO NOT allow this function to get loose in the wild!
+def mock(mod_path):
+    """
+    Recursively inject tree of mocked modules from entire mod_path
+    """
+    name_list = mod_path.split('.')
+    child_name = name_list.pop()
+    child_mod = sys.modules.get(mod_path, types.ModuleType(child_name))
+    if len(name_list) == 0:  # child_name is left-most basic module
+        if child_name not in sys.modules:
+            sys.modules[child_name] = child_mod
+        return sys.modules[child_name]
+    else:
+        # New or existing child becomes parent
+        recurse_path = ".".join(name_list)
+        parent_mod = mock(recurse_path)
+        if not hasattr(sys.modules[recurse_path], child_name):
+            setattr(parent_mod, child_name, child_mod)
+            # full-name also points at child module
+            sys.modules[mod_path] = child_mod
+        return sys.modules[mod_path]
+
+setattr(mock('autotest.client.shared.error'), 'AutotestError', Exception)
+setattr(mock('autotest.client.shared.error'), 'CmdError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestFail', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestNAError', Exception)
+setattr(mock('autotest.client.utils'), 'PlaceHolder', Exception)
+
+
+class TestDockerEvents(TestCase):
+
+    cid = ("ae5f8ee3cdc14512fbc6f908f06cc859"
+           "0b53d0eb9e36cf543165d130f1169a0e")
+
+    nid = ("aa5e8221edf314708c2e0fbc80b671b2"
+           "e11464c87c5bd52b93a01c38538d978b")
+
+    event_log = """
+2016-04-06T09:54:07.108386649-04:00 container start {cid} (image=foo:bar)
+2016-04-06T09:54:06.640353011-04:00 container create {cid} (image=foo:bar)
+2016-04-06T09:54:07.096096286-04:00 network connect {nid} (container={cid})
+2016-04-06T09:54:07.442663135-04:00 container die {cid} (image=foo:bar)
+2016-04-06T09:54:06.640353011-04:00 container create {cid} (image=foo:bar)
+this line is garbage
+2016-04-06T09:54:07.442663135-04:00 container kill {cid} (image=foo:bar)
+"""
+
+    def setUp(self):
+        import dockertest.output
+        self.output = dockertest.output
+        self.event_log = self.event_log.format(cid=self.cid, nid=self.nid)
+
+    def tearDown(self):
+        del self.output
+
+    def test_parse_events(self):
+        events_list = self.output.parse_events(self.event_log)
+        self.assertEqual(len(events_list), 6)
+        _id, details = events_list[0]
+        self.assertEqual(_id, self.cid)
+        self.assertEqual(details['operation'], 'start')
+        self.assertEqual(details['source'], 'foo:bar')
+        self.assertEqual(events_list[2][0], self.nid)
+        self.assertEqual(events_list[2][1]['source'], None)
+
+    def test_parse_events_slop(self):
+        from dockertest.xceptions import DockerValueError
+        self.output.parse_events(self.event_log, 2)
+        self.assertRaises(DockerValueError,
+                          self.output.parse_events, self.event_log, 1)
+
+    def test_by_id(self):
+        dockerevents = self.output.DockerEvents(
+            self.output.parse_events(self.event_log))
+        self.assertEqual(set(dockerevents.keys()), set([self.cid, self.nid]))
+        self.assertEqual(len(dockerevents[self.nid]), 1)
+        # Duplicate create removed, ordered by time then insertion
+        operations = [details['operation']
+                      for details in dockerevents[self.cid]]
+        self.assertEqual(operations, ['create', 'start', 'die', 'kill'])
+
+    def test_extend(self):
+        events_list = self.output.parse_events(self.event_log)
+        dockerevents = self.output.DockerEvents(events_list[:3])
+        # Overlapping with previous
+        self.assertEqual(dockerevents.extend(events_list), 2)
+        self.assertEqual(dockerevents.extend(events_list), 0)
+        self.assertEqual(len(dockerevents[self.cid]), 4)
+
+
+if __name__ == '__main__':
+    main()
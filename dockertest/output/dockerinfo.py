@@ -4,6 +4,7 @@ machine-friendly form.
 """
 
 import subprocess
+from . daemoncache import DaemonCache
 
 
 def _normalize(key):
@@ -18,27 +19,35 @@ class DockerInfo(object):
     Parser of 'docker info' output
     """
 
-    def __init__(self, info_string=None, docker_path=None):
+    def __init__(self, info_string=None, docker_path=None, cache=False):
         """
         info_string parameter is for testing only. Do not use in production.
+        Set cache to True only when reading values which can't change
+        while the daemon runs (e.g. not container or image counts).
         """
         self._info_string = info_string
         self._info_table = None
         self._docker_path = docker_path
+        self._cache = cache
 
     @property
     def info_string(self):
         """
         Runs 'docker info' and returns output as a flat string.
         (Or, in testing environment, returns the passed-in info_string)
+        When enabled, output is cached until the docker daemon restarts.
         """
         if self._info_string is None:
             docker = self._docker_path
             if docker is None:
                 docker = 'docker'
-            self._info_string = subprocess.check_output(docker + ' info',
-                                                        shell=True,
-                                                        close_fds=True)
+            command = docker + ' info'
+            run = lambda: subprocess.check_output(command, shell=True,
+                                                  close_fds=True)
+            if self._cache:
+                self._info_string = DaemonCache.get(command, run)
+            else:
+                self._info_string = run()
         return self._info_string
 
     @property
@@ -10,6 +10,7 @@ import subprocess
 from autotest.client import utils
 from dockertest.xceptions import DockerOutputError, DockerTestNAError
 from dockertest.version import LooseVersion
+from . daemoncache import DaemonCache
 
 
 class DockerVersion(object):
@@ -18,7 +19,8 @@ class DockerVersion(object):
     Parser of docker-cli version command output as client/server properties
 
     :param version_string: Raw, possibly empty or multi-line output
-                           from docker version command.
+                           from docker version command.  When ``None``,
+                           command output is cached until daemon restarts.
     """
     #: Raw, possibly empty or multi-line output from docker version command.
     #: Read-only, set in __init__
@@ -37,9 +39,11 @@ class DockerVersion(object):
         if version_string is None:
             if docker_path is None:
                 docker_path = 'docker'
-            version_string = subprocess.check_output(docker_path + ' version',
-                                                     shell=True,
-                                                     close_fds=True)
+            command = docker_path + ' version'
+            version_string = DaemonCache.get(
+                command, lambda: subprocess.check_output(command,
+                                                         shell=True,
+                                                         close_fds=True))
         self.version_string = version_string
         # FIXME: This should call super(...).__init__(...) (my bad)
 
@@ -0,0 +1,134 @@
+"""
+Verify delivery of signals to a container, by matching lines its signal
+handlers print (e.g. ``Received 10, ignoring...``) against signals sent.
+
+Output of a running ``AsyncDockerCmd`` (or anything else with a ``stdout``
+attribute) is read incrementally.  Each line is only examined once, in
+the order it arrived, and waiting for any number of signals is bounded by
+a single deadline.  The delay between sending each signal, and observing
+its handler output, is recorded as its delivery latency.
+"""
+
+import time
+
+
+SIGNAL_MAP = {1: 'HUP', 2: 'INT', 3: 'QUIT', 4: 'ILL', 5: 'TRAP', 6: 'ABRT',
+              7: 'BUS', 8: 'FPE', 9: 'KILL', 10: 'USR1', 11: 'SEGV',
+              12: 'USR2', 13: 'PIPE', 14: 'ALRM', 15: 'TERM', 16: 'STKFLT',
+              17: 'CHLD', 18: 'CONT', 19: 'STOP', 20: 'TSTP', 21: 'TTIN',
+              22: 'TTOU', 23: 'URG', 24: 'XCPU', 25: 'XFSZ', 26: 'VTALRM',
+              27: 'PROF', 28: 'WINCH', 29: 'IO', 30: 'PWR', 31: 'SYS'}
+
+
+class OutputLines(object):   # only read() pylint: disable=R0903
+
+    """
+    Returns only complete lines of ``source.stdout`` not yet returned
+
+    :param source: Object with ``stdout`` attribute holding all output
+                   so far, e.g. an ``AsyncDockerCmd`` instance.
+    :param skip_existing: When True, ignore any output already present
+    """
+
+    #: Character offset into ``source.stdout`` of next unread output
+    offset = 0
+
+    #: Incomplete last line of output read so far
+    partial = ''
+
+    #: All complete lines returned, in order received
+    lines = None
+
+    def __init__(self, source, skip_existing=True):
+        self.source = source
+        self.lines = []
+        if skip_existing:
+            self.offset = len(source.stdout)
+
+    def read(self):
+        """
+        Return list of ``(arrival time, line)`` for each new complete line
+        """
+        stdout = self.source.stdout
+        arrival = time.time()
+        new_lines = (self.partial + stdout[self.offset:]).split('\n')
+        self.offset = len(stdout)
+        self.partial = new_lines.pop()
+        # Lines end with \r\n when a tty is allocated
+        new_lines = [line.rstrip('\r') for line in new_lines]
+        self.lines += new_lines
+        return [(arrival, line) for line in new_lines]
+
+
+class SignalVerifier(object):
+
+    """
+    Matches expected signal handler output lines against a container's output
+
+    :param source: Passed through to ``OutputLines``
+    :param check_fmt: Format of line printed by handler for signal number,
+                      e.g. ``Received %s, ignoring...``
+    :param step: Seconds between reading output, None to use ``step``
+    """
+
+    #: Seconds to sleep between reading output while waiting
+    step = 0.01
+
+    #: List of ``(signal, seconds)`` delivery latencies, in order observed
+    latencies = None
+
+    def __init__(self, source, check_fmt, step=None):
+        self.output = OutputLines(source)
+        self.check_fmt = check_fmt
+        if step is not None:
+            self.step = step
+        self.latencies = []
+        # List of (line, signal, sent time) not yet observed
+        self._pending = []
+
+    @property
+    def pending(self):
+        """List of expected lines not yet observed, in order expected"""
+        return [line for line, _, _ in self._pending]
+
+    def expect(self, signal, sent=None):
+        """
+        Record signal was sent, so its handler output is expected.
+
+        :param signal: Signal number
+        :param sent: Time signal was sent, None for now
+        """
+        if sent is None:
+            sent = time.time()
+        self._pending.append((self.check_fmt % signal, signal, sent))
+
+    def _match(self, arrival, line, ordered):
+        """Remove first pending (or any, if not ordered) matching line"""
+        for index, (check, signal, sent) in enumerate(self._pending):
+            if line == check:
+                del self._pending[index]
+                self.latencies.append((signal, max(arrival - sent, 0.0)))
+                return True
+            if ordered:
+                break
+        return False
+
+    def wait(self, timeout, ordered=True):
+        """
+        Wait until all expected lines are observed, or timeout expires
+
+        :param timeout: Maximum seconds to wait for all expected lines
+        :param ordered: When False, lines may arrive in any order
+        :return: List of expected lines not observed (empty on success)
+        """
+        deadline = time.time() + timeout
+        while True:
+            for arrival, line in self.output.read():
+                self._match(arrival, line, ordered)
+            remaining = deadline - time.time()
+            if not self._pending or remaining <= 0:
+                break
+            time.sleep(min(self.step, remaining))
+        missing = self.pending
+        self._pending = []
+        return missing
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+# Pylint runs from a different directory, it's fine to import this way
+# pylint: disable=W0403
+
+import unittest
+
+
+class FakeCmd(object):
+
+    """Simulated AsyncDockerCmd, output grows on each later stdout access"""
+
+    def __init__(self, stdout='', chunks=None):
+        self.output = stdout
+        if chunks is None:
+            chunks = []
+        self.chunks = list(chunks)
+        self.reads = 0
+
+    @property
+    def stdout(self):
+        self.reads += 1
+        if self.reads > 1 and self.chunks:
+            self.output += self.chunks.pop(0)
+        return self.output
+
+
+class TestOutputLines(unittest.TestCase):
+
+    def setUp(self):
+        import signals
+        self.signals = signals
+
+    def test_incremental(self):
+        cmd = FakeCmd('READY\r\n', ['foo\r\nba', 'r\n', '', 'baz'])
+        output = self.signals.OutputLines(cmd)
+        self.assertEqual([line for _, line in output.read()], ['foo'])
+        self.assertEqual([line for _, line in output.read()], ['bar'])
+        self.assertEqual(output.read(), [])
+        self.assertEqual(output.read(), [])
+        self.assertEqual(output.partial, 'baz')
+        self.assertEqual(output.lines, ['foo', 'bar'])
+
+    def test_existing(self):
+        cmd = FakeCmd('READY\n')
+        output = self.signals.OutputLines(cmd, skip_existing=False)
+        self.assertEqual([line for _, line in output.read()], ['READY'])
+
+
+class TestSignalVerifier(unittest.TestCase):
+
+    check = 'Received %s, ignoring...'
+
+    def setUp(self):
+        import signals
+        self.signals = signals
+
+    def verifier(self, *chunks):
+        return self.signals.SignalVerifier(FakeCmd('READY\n', chunks),
+                                           self.check, step=0.001)
+
+    def test_ordered(self):
+        verifier = self.verifier('Received 1, ignoring...\n',
+                                 'noise\nReceived 2, ignoring...\n')
+        verifier.expect(1, 0.0)
+        verifier.expect(2, 0.0)
+        self.assertEqual(verifier.wait(1.0), [])
+        self.assertEqual([signal for signal, _ in verifier.latencies], [1, 2])
+        self.assertTrue(all(seconds > 0 for _, seconds in verifier.latencies))
+
+    def test_out_of_order(self):
+        chunks = ('Received 2, ignoring...\n', 'Received 1, ignoring...\n')
+        verifier = self.verifier(*chunks)
+        verifier.expect(1)
+        verifier.expect(2)
+        self.assertEqual(verifier.wait(0.05), ['Received 2, ignoring...'])
+        self.assertEqual(verifier.pending, [])
+        verifier = self.verifier(*chunks)
+        verifier.expect(1)
+        verifier.expect(2)
+        self.assertEqual(verifier.wait(1.0, ordered=False), [])
+
+    def test_missing(self):
+        verifier = self.verifier('Received 1, ignoring...\n')
+        verifier.expect(1)
+        verifier.expect(1)
+        verifier.expect(3)
+        self.assertEqual(verifier.wait(0.05),
+                         ['Received 1, ignoring...',
+                          'Received 3, ignoring...'])
+        self.assertEqual(len(verifier.latencies), 1)
+
+    def test_no_busy_wait(self):
+        verifier = self.verifier()
+        verifier.step = 0.01
+        verifier.expect(1)
+        self.assertEqual(len(verifier.wait(0.1)), 1)
+        # Roughly one read per step, not thousands
+        self.assertTrue(verifier.output.source.reads < 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Record wall/CPU seconds spent in each subtest stage, and docker command
+durations, for later analysis (e.g. by ``results2sqlite``).
+
+Records are lists of dictionaries, from ``Subtest.stage_records()`` and
+``Subtest.command_records()``.  Besides the subtest's own results
+directory, stage records from every subtest are merged into a single
+``stage_times.json`` in the job results directory.
+"""
+
+import json
+import os.path
+import tempfile
+
+
+def perf_keyvals(records):
+    """
+    Return dictionary of ``<stage>_wall`` and ``<stage>_cpu`` seconds,
+    prefixed by ``<subsubtest>.`` for sub-subtest stages.
+
+    :param records: List of stage record dictionaries
+    """
+    perf = {}
+    for record in records:
+        if record['subsubtest'] is None:
+            prefix = record['stage']
+        else:
+            prefix = '%s.%s' % (record['subsubtest'], record['stage'])
+        for kind in ('wall', 'cpu'):
+            key = '%s_%s' % (prefix, kind)
+            # e.g. postprocess_iteration called more than once
+            perf[key] = perf.get(key, 0.0) + record[kind]
+    return perf
+
+
+def merge_job_records(path, section, records):
+    """
+    Replace section's records in JSON file at path, keeping all others
+
+    :param path: Full path to (possibly missing or corrupt) JSON file
+    :param section: Key to store records under, i.e. subtest name
+    :param records: List of stage record dictionaries
+    :raise IOError: On failure to write file
+    :raise OSError: On failure to rename file into place
+    """
+    try:
+        with open(path, 'rb') as timesfile:
+            job_records = json.load(timesfile)
+    except (IOError, ValueError):
+        job_records = {}
+    job_records[section] = records
+    # Rename is atomic, readers never see a partial file
+    (fdes, tmppath) = tempfile.mkstemp(prefix='stage_times',
+                                       dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fdes, 'wb') as timesfile:
+            json.dump(job_records, timesfile, indent=1, sort_keys=True)
+        os.rename(tmppath, path)
+    except (IOError, OSError):
+        os.unlink(tmppath)
+        raise
+
+
+def write_stage_times(subtest):
+    """
+    Write per-stage wall/CPU seconds as perf keyvals, ``stage_times.json``
+    in ``resultsdir`` and merged into ``stage_times.json`` in job results.
+    Docker command durations are written to ``command_times.json`` in
+    ``resultsdir``.  Failures to write files are only logged.
+
+    :param subtest: A ``subtest.Subtest`` subclass instance
+    """
+    records = subtest.stage_records()
+    subtest.write_perf_keyval(perf_keyvals(records))
+    try:
+        with open(os.path.join(subtest.resultsdir,
+                               'stage_times.json'), 'wb') as timesfile:
+            json.dump(records, timesfile, indent=1, sort_keys=True)
+        with open(os.path.join(subtest.resultsdir,
+                               'command_times.json'), 'wb') as timesfile:
+            json.dump(subtest.command_records(), timesfile, indent=1,
+                      sort_keys=True)
+        merge_job_records(os.path.join(subtest.job.resultdir,
+                                       'stage_times.json'),
+                          subtest.config_section, records)
+    except (IOError, OSError), xcept:
+        subtest.logwarning("Unable to record stage times: %s", xcept)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+# Pylint runs from a different directory, it's fine to import this way
+# pylint: disable=W0403
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestPerfKeyvals(unittest.TestCase):
+
+    def setUp(self):
+        import stagetimes
+        self.stagetimes = stagetimes
+
+    def test_keys(self):
+        records = [{'stage': 'run_once', 'subsubtest': None,
+                    'wall': 2.0, 'cpu': 0.5},
+                   {'stage': 'postprocess_iteration', 'subsubtest': None,
+                    'wall': 1.0, 'cpu': 0.25},
+                   {'stage': 'postprocess_iteration', 'subsubtest': None,
+                    'wall': 1.0, 'cpu': 0.25},
+                   {'stage': 'run_once', 'subsubtest': 'foo',
+                    'wall': 3.0, 'cpu': 1.0}]
+        self.assertEqual(self.stagetimes.perf_keyvals(records),
+                         {'run_once_wall': 2.0, 'run_once_cpu': 0.5,
+                          'postprocess_iteration_wall': 2.0,
+                          'postprocess_iteration_cpu': 0.5,
+                          'foo.run_once_wall': 3.0,
+                          'foo.run_once_cpu': 1.0})
+
+
+class TestMergeJobRecords(unittest.TestCase):
+
+    def setUp(self):
+        import stagetimes
+        self.stagetimes = stagetimes
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'stage_times.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def load(self):
+        with open(self.path, 'rb') as timesfile:
+            return json.load(timesfile)
+
+    def test_merge(self):
+        self.stagetimes.merge_job_records(self.path, 'one', [1])
+        self.stagetimes.merge_job_records(self.path, 'two', [2])
+        self.stagetimes.merge_job_records(self.path, 'one', [3])
+        self.assertEqual(self.load(), {'one': [3], 'two': [2]})
+        self.assertEqual(os.listdir(self.tmpdir), ['stage_times.json'])
+
+    def test_corrupt(self):
+        with open(self.path, 'wb') as timesfile:
+            timesfile.write('{"one": [')
+        self.stagetimes.merge_job_records(self.path, 'two', [2])
+        self.assertEqual(self.load(), {'two': [2]})
+
+    def test_no_temp_left(self):
+        os.mkdir(self.path)  # rename() onto a directory fails
+        self.assertRaises(OSError, self.stagetimes.merge_job_records,
+                          self.path, 'one', [1])
+        self.assertEqual(os.listdir(self.tmpdir), ['stage_times.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
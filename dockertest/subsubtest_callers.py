@@ -0,0 +1,121 @@
+"""
+Additional ``SubSubtestCaller`` variations, which run sub-subtests
+concurrently.  See the `subtest module`_ for the basic interface.
+"""
+
+# Pylint runs from a different directory, it's fine to import this way
+# pylint: disable=W0403
+
+import sys
+import threading
+import Queue
+import subtestbase
+from subtest import SubSubtestCaller
+
+
+class SubSubtestCallerParallel(SubSubtestCaller):
+
+    r"""
+    Variation on SubSubtestCaller that runs sub-subtests on a worker pool.
+
+    Each child subsubtest's ``initialize``, ``run_once``, ``postprocess``,
+    and ``cleanup`` are executed in order, same as ``SubSubtestCaller``,
+    but up to ``parallel_subsubtests`` (config. option or class attribute)
+    subsubtests do so concurrently in separate threads.  Log messages from
+    each thread are prefixed by the sub-subtest name.  Sub-subtests with a
+    true ``exclusive`` class attribute run alone, one by one, after all
+    others have completed.
+
+    :param \*args: Passed through to super-class.
+    :param \*\*dargs: Passed through to super-class.
+    """
+
+    #: Default maximum number of concurrently running sub-subtests
+    parallel_subsubtests = 4
+
+    def __init__(self, *args, **dargs):
+        #: Private per-thread storage (do not use)
+        self._thread_local = threading.local()
+        super(SubSubtestCallerParallel, self).__init__(*args, **dargs)
+
+    # Each thread records (then reads) details about it's own exception
+    @property
+    def exception_info(self):
+        """
+        Dictionary like ``SubSubtestCaller.exception_info``, but per-thread
+        """
+        try:
+            return self._thread_local.exception_info
+        except AttributeError:
+            self._thread_local.exception_info = {}
+            return self._thread_local.exception_info
+
+    @exception_info.setter
+    def exception_info(self, value):  # pylint: disable=E0102,E0202
+        self._thread_local.exception_info = value
+
+    def run_worker(self, pending, cleanup_errors):
+        """
+        Call ``run_all_stages()`` on (name, subsubtest) tuples until none left
+
+        :param pending: ``Queue.Queue`` instance of (name, subsubtest) tuples
+        :param cleanup_errors: List to append cleanup exception infos onto
+        """
+        while True:
+            try:
+                name, subsubtest = pending.get_nowait()
+            except Queue.Empty:
+                return
+            subtestbase.THREAD_LOCAL.log_prefix = '[%s] ' % name
+            try:
+                self.run_all_stages(name, subsubtest)
+            # Catching general exception, it must not kill this worker and
+            # will be re-raised after all sub-subtests have finished.
+            # pylint: disable=W0703
+            except Exception:
+                cleanup_errors.append(sys.exc_info())
+            finally:
+                subtestbase.THREAD_LOCAL.log_prefix = ''
+
+    def run_once(self):
+        """
+        Instantiate all sub-subtests in order, then run their stages
+        concurrently on at most ``parallel_subsubtests`` threads.
+        Sub-subtest ``cleanup()`` failures are re-raised after all have
+        completed.
+        """
+        # DO NOT CALL superclass run_once(); it runs in sequence.
+        self.log_step_msg('run_once')
+        if not self.subsubtest_names:
+            self.logwarning("No sub-subtests configured to run "
+                            "for subtest %s" % self.config_section)
+            return
+        pending = Queue.Queue()
+        exclusive = []
+        # Instantiate in order, keyval writes & tmpdir creation not parallel
+        for name in self.subsubtest_names:
+            subsubtest = self.new_subsubtest(name)
+            if subsubtest is None:
+                continue  # Assume a message was already logged
+            if subsubtest.exclusive:
+                exclusive.append((name, subsubtest))
+            else:
+                pending.put((name, subsubtest))
+        n_workers = min(int(self.config.get('parallel_subsubtests',
+                                            self.parallel_subsubtests)),
+                        pending.qsize())
+        cleanup_errors = []
+        workers = [threading.Thread(target=self.run_worker,
+                                    args=(pending, cleanup_errors),
+                                    name='%s_%d' % (self.config_section, num))
+                   for num in xrange(n_workers)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        for name, subsubtest in exclusive:
+            pending.put((name, subsubtest))
+        self.run_worker(pending, cleanup_errors)
+        if cleanup_errors:
+            exc_info = cleanup_errors[0]
+            raise exc_info[0], exc_info[1], exc_info[2]
@@ -16,18 +16,23 @@ import os.path
 import imp
 import sys
 import copy
+import threading
+import time
 from ConfigParser import Error
-from autotest.client.shared.error import TestError, TestNAError
+from autotest.client.shared.error import TestError, TestNAError, CmdError
 from autotest.client.shared.version import get_version
 from autotest.client import test
 import version
 import config
 import subtestbase
+import stagetimes
+from leakcheck import LeakCheck
 from xceptions import DockerTestFail
 from xceptions import DockerTestNAError
 from xceptions import DockerTestError
 from xceptions import DockerSubSubtestNAError
 from dockertest.environment import selinux_is_enforcing
+from dockertest.output import DaemonCache
 import dockertest.docker_daemon as docker_daemon
 
 
@@ -56,6 +61,10 @@ class Subtest(subtestbase.SubBase, test.test):
     #: Private cache of control.ini's [Control] section contents (do not use!)
     _control_ini = None
 
+    #: ``LeakCheck`` instance, snapshot from ``initialize()`` when
+    #: the ``leak_check`` option is enabled, otherwise None.
+    leak_check = None
+
     def __init__(self, *args, **dargs):
 
         def _make_cfgsect():
@@ -107,6 +116,8 @@ class Subtest(subtestbase.SubBase, test.test):
             self.write_test_keyval(self.config)
 
         super(Subtest, self).__init__(*args, **dargs)
+        # Share docker info/version output with later subtests
+        DaemonCache.cache_dir = self.job.resultdir
         _init_config()
         _init_logging()
         # Optionally setup different iterations if option exists
@@ -151,6 +162,31 @@ class Subtest(subtestbase.SubBase, test.test):
             self.failif(not selinux_is_enforcing(),
                         "SELinux mode != Enforcing and"
                         " verify_enforcing is set")
+        if self.config.get('leak_check', False):
+            try:
+                self.leak_check = LeakCheck(self)
+            except (CmdError, OSError), xcept:
+                self.logdebug("Not checking for leaks, unable to snapshot: "
+                              "%s", xcept)
+
+    def cleanup_finished(self, failed):
+        """
+        Report, and possibly remove, containers/images leaked by the test
+        (when ``leak_check`` option is enabled).
+
+        :param failed: True if ``cleanup()`` raised an exception
+        :raise DockerTestFail: If ``fail_on_leaks`` option is enabled, and
+                               ``cleanup()`` didn't already fail.
+        """
+        try:
+            if self.leak_check is None:
+                leaks = ''
+            else:
+                leaks = self.leak_check.report()
+        finally:
+            super(Subtest, self).cleanup_finished(failed)
+        if leaks and not failed and self.config.get('fail_on_leaks', False):
+            raise DockerTestFail(leaks)
 
     def postprocess_iteration(self):
         """
@@ -158,6 +194,28 @@ class Subtest(subtestbase.SubBase, test.test):
         """
         self.log_step_msg('postprocess_iteration')
 
+    def stage_records(self):
+        """
+        Return list of ``stage_times`` dictionaries for this and any
+        sub-subtests, with added ``subtest`` and ``subsubtest`` keys.
+        """
+        return [dict(record, subtest=self.config_section, subsubtest=None)
+                for record in self.stage_times]
+
+    def command_records(self):
+        """
+        Same as ``stage_records()`` but for ``command_times``
+        """
+        return [dict(record, subtest=self.config_section, subsubtest=None)
+                for record in self.command_times]
+
+    def write_stage_times(self):
+        """
+        Write ``stage_records()`` and ``command_records()``, see
+        ``stagetimes.write_stage_times()``
+        """
+        stagetimes.write_stage_times(self)
+
     def _control_ini_section(self, section):
         if self._control_ini is None:
             self._control_ini = {}  # empty set of caches
@@ -215,6 +273,10 @@ class SubSubtest(subtestbase.SubBase):
     #: Number of additional space/tab characters to prefix when logging
     n_tabs = 2     # two-levels
 
+    #: When True, ``SubSubtestCallerParallel`` never runs this sub-subtest
+    #: concurrently with any other (e.g. it restarts or reconfigures daemon)
+    exclusive = False
+
     def __init__(self, parent_subtest):
         super(SubSubtest, self).__init__()
         classname = self.__class__.__name__
@@ -511,9 +573,35 @@ class SubSubtestCaller(Subtest):
         failed_tests = start_subsubtests - self.final_subsubtests
 
         if failed_tests:
+            self.write_failed_subsubtests(failed_tests)
             raise DockerTestFail('Sub-subtest failures: %s' %
                                  str(failed_tests))
 
+    def write_failed_subsubtests(self, failed_tests):
+        """
+        Record names of failed sub-subtests (e.g. for ``--args rerun=``)
+
+        :param failed_tests: Iterable of sub-subtest names
+        """
+        self.write_test_keyval({'failed_subsubtests':
+                                ",".join(sorted(failed_tests))})
+
+    def stage_records(self):
+        records = super(SubSubtestCaller, self).stage_records()
+        for name, subsubtest in sorted(self.start_subsubtests.items()):
+            records += [dict(record, subtest=self.config_section,
+                             subsubtest=name)
+                        for record in subsubtest.stage_times]
+        return records
+
+    def command_records(self):
+        records = super(SubSubtestCaller, self).command_records()
+        for name, subsubtest in sorted(self.start_subsubtests.items()):
+            records += [dict(record, subtest=self.config_section,
+                             subsubtest=name)
+                        for record in subsubtest.command_times]
+        return records
+
     def call_subsubtest_method(self, method):
         """
         Call ``method``, recording execution info. on exception.
@@ -659,10 +747,22 @@ class SubSubtestCallerSimultaneous(SubSubtestCaller):
     configuration is passed to subsubtest, with the subsubtest's section
     overriding values with the same option name.
 
+    When the ``concurrent_run_once`` option (or class attribute) is true,
+    every subsubtest's ``run_once`` is started at the same moment in it's
+    own thread, and all must return within ``run_once_timeout`` seconds
+    (option or class attribute) of that start, otherwise they're considered
+    failed.
+
     :param \*args: Passed through to super-class.
     :param \*\*dargs: Passed through to super-class.
     """
 
+    #: Default for ``concurrent_run_once`` configuration option
+    concurrent_run_once = False
+
+    #: Default for ``run_once_timeout`` configuration option (seconds)
+    run_once_timeout = 600.0
+
     #: Dictionary of subsubtests names to instances which successfully
     #: executed ``initialize()`` w/o raising exception
     run_subsubtests = None
@@ -671,10 +771,17 @@ class SubSubtestCallerSimultaneous(SubSubtestCaller):
     #: executed ``run_once()`` w/o raising exception
     post_subsubtests = None
 
+    #: Set of subsubtest names whose ``run_once()`` missed the deadline
+    timed_out_subsubtests = None
+
     def __init__(self, *args, **dargs):
         super(SubSubtestCallerSimultaneous, self).__init__(*args, **dargs)
         self.run_subsubtests = {}
         self.post_subsubtests = {}
+        self.timed_out_subsubtests = set()
+        #: Private lock for ``post_subsubtests`` and
+        #: ``timed_out_subsubtests`` while run_once() threads run
+        self._post_lock = threading.Lock()
 
     def initialize(self):
         super(SubSubtestCallerSimultaneous, self).initialize()
@@ -702,6 +809,9 @@ class SubSubtestCallerSimultaneous(SubSubtestCaller):
         # DO NOT CALL superclass run_once(); this variation works
         # completely differently!
         self.log_step_msg('run_once')
+        if self.config.get('concurrent_run_once', self.concurrent_run_once):
+            self.run_once_concurrent()
+            return
         for name, subsubtest in self.run_subsubtests.items():
             try:
                 subsubtest.run_once()
@@ -715,6 +825,66 @@ class SubSubtestCallerSimultaneous(SubSubtestCaller):
                 # Log problem, don't add to post_subsubtests
                 self.logtraceback(name, sys.exc_info(), "run_once", detail)
 
+    def run_once_thread(self, name, subsubtest, start_event, exceptions):
+        """
+        Wait for start_event, then call ``subsubtest.run_once()``
+
+        :param name: String, name of subsubtest class (and possibly module)
+        :param subsubtest: Instance of subsubtest or subclass
+        :param start_event: ``threading.Event`` instance, set for all to start
+        :param exceptions: Dictionary of name to exc_info from ``run_once()``
+        """
+        subtestbase.THREAD_LOCAL.log_prefix = '[%s] ' % name
+        start_event.wait()
+        try:
+            subsubtest.run_once()
+            with self._post_lock:
+                # Returned after deadline, already considered failed
+                if name not in self.timed_out_subsubtests:
+                    # Allow postprocess()
+                    self.post_subsubtests[name] = subsubtest
+        # Catching general exception here, b/c it must be recorded for
+        # the calling thread.  Cleanup step must be guaranteed to run.
+        # pylint: disable=W0703
+        except Exception:
+            exceptions[name] = sys.exc_info()
+
+    def run_once_concurrent(self):
+        """
+        Call all subsubtest's ``run_once()`` at the same time, in separate
+        threads, waiting no longer than ``run_once_timeout`` for all.
+        Subsubtests that raise or don't finish in time are considered failed.
+        """
+        start_event = threading.Event()
+        exceptions = {}
+        threads = {}
+        for name, subsubtest in self.run_subsubtests.items():
+            threads[name] = threading.Thread(target=self.run_once_thread,
+                                             args=(name, subsubtest,
+                                                   start_event, exceptions),
+                                             name=name)
+            # Don't block process exit on a thread that never returns
+            threads[name].daemon = True
+            threads[name].start()
+        timeout = float(self.config.get('run_once_timeout',
+                                        self.run_once_timeout))
+        # All threads are created & waiting, release them together
+        deadline = time.time() + timeout
+        start_event.set()
+        for name, thread in threads.items():
+            thread.join(max(deadline - time.time(), 0))
+            with self._post_lock:
+                if not thread.is_alive():
+                    continue
+                # Can't be stopped, don't let postprocess() race with it
+                self.timed_out_subsubtests.add(name)
+                self.post_subsubtests.pop(name, None)
+            self.logerror("%s: run_once() still running after %0.2f "
+                          "second deadline", name, timeout)
+        for name, exc_info in exceptions.items():
+            # Log problem, it wasn't added to post_subsubtests
+            self.logtraceback(name, exc_info, "run_once", exc_info[1])
+
     def postprocess(self):
         # DO NOT CALL superclass postprocess(); this variation works
         # completely differently!
@@ -722,6 +892,8 @@ class SubSubtestCallerSimultaneous(SubSubtestCaller):
         start_subsubtests = set(self.start_subsubtests.keys())
         final_subsubtests = set()
         for name, subsubtest in self.post_subsubtests.items():
+            if name in self.timed_out_subsubtests:
+                continue  # Never passes, see below
             try:
                 subsubtest.postprocess()
                 # Will form "passed" set
@@ -733,9 +905,13 @@ class SubSubtestCallerSimultaneous(SubSubtestCaller):
                 # Forms "failed" set by exclusion from final_subsubtests
                 self.logtraceback(name, sys.exc_info(), "postprocess",
                                   detail)
+        # Explicitly failed, even if run_once() returned after deadline
+        final_subsubtests -= self.timed_out_subsubtests
         if not final_subsubtests == start_subsubtests:
+            failed_tests = start_subsubtests - final_subsubtests
+            self.write_failed_subsubtests(failed_tests)
             raise DockerTestFail('Sub-subtest failures: %s'
-                                 % str(start_subsubtests - final_subsubtests))
+                                 % str(failed_tests))
 
     def cleanup(self):
         super(SubSubtestCallerSimultaneous, self).cleanup()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+
+# Pylint runs from a different directory, it's fine to import this way
+# pylint: disable=W0403
+# There is magic requiring attributes defined outside the __init__
+# pylint: disable=W0201
+
+import sys
+import threading
+import time
+import types
+import unittest
+
+
+# DO NOT allow this function to get loose in the wild!
+def mock(mod_path):
+    """
+    Recursivly inject tree of mocked modules from entire mod_path
+    """
+    name_list = mod_path.split('.')
+    child_name = name_list.pop()
+    child_mod = sys.modules.get(mod_path, types.ModuleType(child_name))
+    if len(name_list) == 0:  # child_name is left-most basic module
+        if child_name not in sys.modules:
+            sys.modules[child_name] = child_mod
+        return sys.modules[child_name]
+    else:
+        # New or existing child becomes parent
+        recurse_path = ".".join(name_list)
+        parent_mod = mock(recurse_path)
+        if not hasattr(sys.modules[recurse_path], child_name):
+            setattr(parent_mod, child_name, child_mod)
+            # full-name also points at child module
+            sys.modules[mod_path] = child_mod
+        return sys.modules[mod_path]
+
+
+class TestNAError(Exception):
+
+    """Fake class, so other exceptions aren't treated as N/A"""
+    pass
+
+# Mock module and class in one stroke
+setattr(mock('autotest.client.test'), 'test', object)
+# Mock module and exception class in one stroke
+setattr(mock('autotest.client.shared.error'), 'CmdError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestFail', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestError', Exception)
+setattr(mock('autotest.client.shared.error'), 'TestNAError', TestNAError)
+setattr(mock('autotest.client.shared.error'), 'AutotestError', Exception)
+setattr(mock('autotest.client.shared.version'), 'get_version',
+        lambda: version.AUTOTESTVERSION)
+# Need all three for Subtest class
+mock('autotest.client.shared.base_job')
+mock('autotest.client.shared.job')
+mock('autotest.client.shared.utils')
+mock('autotest.client.utils')
+mock('autotest.client.job')
+
+import version
+
+
+class FakeSubSubtest(object):
+
+    """Records each stage called, optionally sleeping or raising in some"""
+
+    exclusive = False
+
+    def __init__(self, name, calls, sleep=0.0, raises=()):
+        self.name = name
+        self.calls = calls
+        self.sleep = sleep
+        self.raises = raises
+        self.finished = threading.Event()
+
+    def stage(self, stage):
+        self.calls.append((self.name, stage))
+        if stage == 'run_once':
+            time.sleep(self.sleep)
+        if stage in self.raises:
+            raise ValueError("%s %s" % (self.name, stage))
+
+    def initialize(self):
+        self.stage('initialize')
+
+    def run_once(self):
+        try:
+            self.stage('run_once')
+        finally:
+            self.finished.set()
+
+    def postprocess(self):
+        self.stage('postprocess')
+
+    def cleanup(self):
+        self.stage('cleanup')
+
+
+class SubSubtestCallerTestBase(unittest.TestCase):
+
+    def setUp(self):
+        import subtest
+        self.subtest = subtest
+        self.calls = []
+        self.keyvals = {}
+
+    def make_caller(self, cls, subsubtests, **config):
+        """Return instance of cls subclass, w/o autotest initialization"""
+        keyvals = self.keyvals
+
+        class FakeCaller(cls):
+            config_section = 'docker_cli/fake'
+
+            def __init__(fake_self):  # pylint: disable=E0213
+                fake_self.config = config
+                fake_self.step_log_msgs = {}
+                fake_self.subsubtest_names = [ss.name for ss in subsubtests]
+                fake_self.start_subsubtests = {}
+                fake_self.final_subsubtests = set()
+                fake_self.new_subsubtest = dict((ss.name, ss)
+                                                for ss in subsubtests).get
+
+            def write_test_keyval(fake_self, keyvals_dict):
+                # pylint: disable=E0213
+                keyvals.update(keyvals_dict)
+
+            def is_known_failure(fake_self, subsubtest=None):
+                # pylint: disable=E0213
+                return False
+
+        return FakeCaller()
+
+
+class TestSimultaneousConcurrent(SubSubtestCallerTestBase):
+
+    def make_caller(self, cls, subsubtests, **config):
+        caller = super(TestSimultaneousConcurrent,
+                       self).make_caller(cls, subsubtests, **config)
+        caller.run_subsubtests = {}
+        caller.post_subsubtests = {}
+        caller.timed_out_subsubtests = set()
+        caller._post_lock = threading.Lock()
+        for subsubtest in subsubtests:
+            caller.start_subsubtests[subsubtest.name] = subsubtest
+            caller.run_subsubtests[subsubtest.name] = subsubtest
+        return caller
+
+    def test_timed_out(self):
+        fast = FakeSubSubtest('fast', self.calls)
+        slow = FakeSubSubtest('slow', self.calls, sleep=0.5)
+        caller = self.make_caller(self.subtest.SubSubtestCallerSimultaneous,
+                                  [fast, slow], concurrent_run_once=True,
+                                  run_once_timeout=0.1)
+        caller.run_once()
+        self.assertEqual(caller.timed_out_subsubtests, set(['slow']))
+        self.assertEqual(caller.post_subsubtests.keys(), ['fast'])
+        # Returning late must not make it eligible for postprocess()
+        self.assertTrue(slow.finished.wait(5))
+        time.sleep(0.01)  # let thread finish after run_once() returns
+        self.assertEqual(caller.post_subsubtests.keys(), ['fast'])
+        self.assertRaises(self.subtest.DockerTestFail, caller.postprocess)
+        self.assertEqual(self.keyvals, {'failed_subsubtests': 'slow'})
+        self.assertFalse(('slow', 'postprocess') in self.calls)
+
+    def test_raises(self):
+        good = FakeSubSubtest('good', self.calls)
+        bad = FakeSubSubtest('bad', self.calls, raises=('run_once',))
+        caller = self.make_caller(self.subtest.SubSubtestCallerSimultaneous,
+                                  [good, bad], concurrent_run_once=True,
+                                  run_once_timeout=5)
+        caller.run_once()
+        self.assertEqual(caller.timed_out_subsubtests, set())
+        self.assertEqual(caller.post_subsubtests.keys(), ['good'])
+        self.assertRaises(self.subtest.DockerTestFail, caller.postprocess)
+        self.assertEqual(self.keyvals, {'failed_subsubtests': 'bad'})
+
+    def test_all_pass(self):
+        subsubtests = [FakeSubSubtest(name, self.calls)
+                       for name in ('one', 'two', 'three')]
+        caller = self.make_caller(self.subtest.SubSubtestCallerSimultaneous,
+                                  subsubtests, concurrent_run_once=True,
+                                  run_once_timeout=5)
+        caller.run_once()
+        caller.postprocess()
+        self.assertEqual(self.keyvals, {})
+        self.assertEqual(sorted(name for name, stage in self.calls
+                                if stage == 'postprocess'),
+                         ['one', 'three', 'two'])
+
+
+class TestParallel(SubSubtestCallerTestBase):
+
+    def setUp(self):
+        super(TestParallel, self).setUp()
+        import subsubtest_callers
+        self.callers = subsubtest_callers
+
+    def make_caller(self, cls, subsubtests, **config):
+        caller = super(TestParallel, self).make_caller(cls, subsubtests,
+                                                       **config)
+        caller._thread_local = threading.local()
+        return caller
+
+    def test_pool(self):
+        lock = threading.Lock()
+        running = set()
+        most = []
+
+        class Counted(FakeSubSubtest):
+
+            def run_once(inner):  # pylint: disable=E0213
+                with lock:
+                    running.add(inner.name)
+                    most.append(len(running))
+                time.sleep(0.05)
+                with lock:
+                    running.discard(inner.name)
+
+        subsubtests = [Counted(str(num), self.calls) for num in xrange(6)]
+        caller = self.make_caller(self.callers.SubSubtestCallerParallel,
+                                  subsubtests, parallel_subsubtests=2)
+        caller.run_once()
+        self.assertEqual(max(most), 2)
+        self.assertEqual(caller.final_subsubtests,
+                         set(str(num) for num in xrange(6)))
+        # Every stage, in order, for each
+        for num in xrange(6):
+            self.assertEqual([stage for name, stage in self.calls
+                              if name == str(num)],
+                             ['initialize', 'postprocess', 'cleanup'])
+        caller.postprocess()
+        self.assertEqual(self.keyvals, {})
+
+    def test_exclusive_last(self):
+        subsubtests = [FakeSubSubtest(name, self.calls, sleep=0.01)
+                       for name in ('alone', 'one', 'two', 'three')]
+        subsubtests[0].exclusive = True
+        caller = self.make_caller(self.callers.SubSubtestCallerParallel,
+                                  subsubtests)
+        caller.run_once()
+        self.assertEqual([stage for name, stage in self.calls[-4:]
+                          if name == 'alone'],
+                         ['initialize', 'run_once', 'postprocess', 'cleanup'])
+        self.assertEqual(len(caller.final_subsubtests), 4)
+
+    def test_failed(self):
+        subsubtests = [FakeSubSubtest('good', self.calls),
+                       FakeSubSubtest('bad', self.calls,
+                                      raises=('postprocess',))]
+        caller = self.make_caller(self.callers.SubSubtestCallerParallel,
+                                  subsubtests)
+        caller.run_once()
+        self.assertEqual(caller.final_subsubtests, set(['good']))
+        self.assertEqual(sorted(caller.start_subsubtests),
+                         ['bad', 'good'])
+        # Cleanup still runs
+        self.assertTrue(('bad', 'cleanup') in self.calls)
+        self.assertRaises(self.subtest.DockerTestFail, caller.postprocess)
+        self.assertEqual(self.keyvals, {'failed_subsubtests': 'bad'})
+
+    def test_cleanup_error(self):
+        subsubtests = [FakeSubSubtest('one', self.calls,
+                                      raises=('cleanup',)),
+                       FakeSubSubtest('two', self.calls)]
+        caller = self.make_caller(self.callers.SubSubtestCallerParallel,
+                                  subsubtests)
+        try:
+            caller.run_once()
+        # TestError is mocked as Exception
+        except Exception, xcept:  # pylint: disable=W0703
+            self.assertTrue('one cleanup' in str(xcept))
+        else:
+            self.fail("Cleanup failure not re-raised")
+        # Raised only after all others finished
+        self.assertTrue(('two', 'cleanup') in self.calls)
+        self.assertEqual(caller.final_subsubtests, set(['one', 'two']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,9 +7,13 @@ modules.
 # Pylint runs from a different directory, it's fine to import this way
 # pylint: disable=W0403
 
+import functools
 import logging
+import os
 import os.path
 import sys
+import threading
+import time
 import traceback
 from xceptions import DockerTestFail
 from xceptions import DockerTestNAError
@@ -17,6 +21,22 @@ from config import CONFIGCUSTOMS, get_as_list
 from environment import docker_rpm
 
 
+#: Per-thread state, ``log_prefix`` attribute is prepended to log messages
+THREAD_LOCAL = threading.local()
+
+#: Names of stage methods which record wall and CPU time when called
+TIMED_STAGES = ('setup', 'initialize', 'run_once', 'postprocess_iteration',
+                'postprocess', 'cleanup')
+
+
+def cpu_time():
+    """
+    Return user + system CPU seconds consumed by this process (all threads)
+    and it's waited-for children (e.g. docker commands).
+    """
+    return sum(os.times()[:4])
+
+
 def known_failures_file():
     """
     Returns path to a file containing a list of known failures.
@@ -62,6 +82,80 @@ def known_failures():
     return known
 
 
+def _nv(nvr):
+    # e.g. docker-1.12.5-8.el7.x86_64 -> docker-1.12.5
+    return nvr[:nvr.rfind('-')]
+
+
+def _nv_base(docker_nv):
+    # e.g. docker-1.12.5 -> docker-1.12
+    return docker_nv[:docker_nv.rfind('.')]
+
+
+class KnownFailuresIndex(object):
+
+    """
+    Process-wide index of ``known_failures()``, re-parsed only when the
+    ``known_failures_file()`` path, size, or modification time changes.
+    Per subtest name, it maps to a dictionary with keys:
+
+    * ``nvr``: Dictionary of exact NVRA to description
+    * ``nv_wild``: Dictionary of NV (from ``NV-*`` entries) to description
+    * ``nv``: Set of NV's from all entries
+    * ``nv_base``: Set of NV bases (NV without last version component)
+    """
+
+    #: Private cache of (path, size, mtime) of parsed file (do not use)
+    _stamp = None
+
+    #: Private cache of subtest name to index dictionary (do not use)
+    _index = None
+
+    @classmethod
+    def get(cls):
+        """
+        Return (cached) dictionary of subtest name to index dictionary
+        """
+        known_failures_path = known_failures_file()
+        try:
+            stat = os.stat(known_failures_path)
+        except OSError, excpt:
+            SubBase.logwarning("Skipping known_failure check: %s" % excpt)
+            return {}
+        stamp = (known_failures_path, stat.st_size, stat.st_mtime)
+        if stamp != cls._stamp:
+            cls._index = cls.make_index(known_failures())
+            cls._stamp = stamp
+        return cls._index
+
+    @staticmethod
+    def make_index(known):
+        """
+        Return subtest name to index dictionary from ``known_failures()``
+        """
+        index = {}
+        for subtest, nvr_why in known.iteritems():
+            nv_wild = {}
+            for nvr, why in nvr_why.iteritems():
+                if nvr.endswith('-*'):
+                    nv_wild[nvr[:-2]] = why
+            nvs = set(_nv(nvr) for nvr in nvr_why)
+            index[subtest] = {'nvr': nvr_why,
+                              'nv_wild': nv_wild,
+                              'nv': nvs,
+                              'nv_base': set(_nv_base(nv) for nv in nvs)}
+        return index
+
+
+def cached_docker_rpm():
+    """
+    Returns ``docker_rpm()``, cached for as long as the same daemon runs
+    """
+    # Not needed by control-file, keep output package confined to here
+    from dockertest.output import DaemonCache
+    return DaemonCache.get('docker_rpm', docker_rpm)
+
+
 class SubBase(object):
 
     """
@@ -106,12 +200,72 @@ class SubBase(object):
     #: Path to file indicating which Red Hat release this is
     redhat_release_filepath = "/etc/redhat-release"
 
+    #: List of dictionaries recording ``stage`` name, ``start`` epoch
+    #: seconds, ``wall`` and ``cpu`` seconds, one per ``TIMED_STAGES``
+    #: method call.  Set by ``__init__`` (read-only)
+    stage_times = None
+
+    #: List of dictionaries recording docker ``command`` (subcommand name),
+    #: ``start`` epoch seconds, ``duration`` seconds, and ``exit_status``,
+    #: one per ``DockerCmd.execute()`` call.  Set by ``__init__`` (read-only)
+    command_times = None
+
     def __init__(self, *args, **dargs):
         super(SubBase, self).__init__(*args, **dargs)
         self.step_log_msgs = self.step_log_msgs.copy()
         # instances can do whatever they like with this, so can sub-classes
         if self.stuff is None:
             self.stuff = {}
+        self.stage_times = []
+        self.command_times = []
+        # Instance attributes, so all overrides (and supers) are timed
+        for stage in TIMED_STAGES:
+            method = getattr(self, stage, None)
+            if method is not None:
+                setattr(self, stage, self._timed_stage(stage, method))
+
+    def _timed_stage(self, stage, method):
+        # Autotest inspects argument names, stage methods take none.
+        @functools.wraps(method)
+        def timed():  # pylint: disable=C0111
+            start = time.time()
+            start_cpu = cpu_time()
+            try:
+                result = method()
+            # Catching general exception only to note it, it's re-raised.
+            # pylint: disable=W0703
+            except Exception:
+                exc_info = sys.exc_info()
+                self._stage_finished(stage, start, start_cpu, True)
+                raise exc_info[0], exc_info[1], exc_info[2]
+            self._stage_finished(stage, start, start_cpu, False)
+            return result
+        return timed
+
+    def _stage_finished(self, stage, start, start_cpu, failed):
+        self.stage_times.append({'stage': stage,
+                                 'start': start,
+                                 'wall': time.time() - start,
+                                 'cpu': cpu_time() - start_cpu})
+        if stage == 'cleanup':
+            self.cleanup_finished(failed)
+
+    def cleanup_finished(self, failed):
+        """
+        Called after the (possibly overridden) ``cleanup()`` returns or
+        raises.  Calls ``write_stage_times()`` by default.
+
+        :param failed: True if ``cleanup()`` raised an exception
+        """
+        del failed  # not used by default
+        self.write_stage_times()
+
+    def write_stage_times(self):
+        """
+        Called by ``cleanup_finished()`` to record ``stage_times`` and
+        ``command_times`` (does nothing by default).
+        """
+        pass
 
     def initialize(self):
         """
@@ -194,22 +348,20 @@ class SubBase(object):
         fullname = self.config_section
         if subsubtest:
             fullname = os.path.join(fullname, subsubtest)
-        known = known_failures()
-        if fullname not in known:
+        known = KnownFailuresIndex.get().get(fullname)
+        if known is None:
             return False
-        docker_nvr = docker_rpm()
-        if docker_nvr in known[fullname]:
-            why = known[fullname][docker_nvr]
+        docker_nvr = cached_docker_rpm()
+        if docker_nvr in known['nvr']:
+            why = known['nvr'][docker_nvr]
             self.logwarning("%s: Known failure on %s: %s",
                             fullname, docker_nvr, why)
             return True
 
         # This exact NVR is not known to fail. What about NV?
-        _nv = lambda nvr: nvr[:nvr.rfind('-')]
         docker_nv = _nv(docker_nvr)
-        docker_nv_wild = docker_nv + '-*'
-        if docker_nv_wild in known[fullname]:
-            why = known[fullname][docker_nv_wild]
+        if docker_nv in known['nv_wild']:
+            why = known['nv_wild'][docker_nv]
             self.logwarning("%s expected to fail on all builds of %s: %s",
                             fullname, docker_nv, why)
             return True
@@ -217,14 +369,13 @@ class SubBase(object):
         # No known failures for NVR or NV. What about other builds of same NV
         # or a related one? These messages are informational only, intended
         # as hints for a test engineer trying to understand new failures.
-        if docker_nv in [_nv(x) for x in known[fullname]]:
+        if docker_nv in known['nv']:
             # e.g. docker is 1.12.5-6, we have an exception for 1.12.5->>5<<
             self.logwarning("%s is known to fail in other %s builds",
                             fullname, docker_nv)
         elif docker_nv.count('.') > 1:
-            _nv_base = lambda nv_orig: nv_orig[:nv_orig.rfind('.')]
             docker_nv_base = _nv_base(docker_nv)
-            if docker_nv_base in [_nv_base(_nv(x)) for x in known[fullname]]:
+            if docker_nv_base in known['nv_base']:
                 # e.g. docker is 1.12.6-1, we have exception for 1.12.>>5<<-*
                 self.logwarning("%s is known to fail in other %s.x builds",
                                 fullname, docker_nv_base)
@@ -338,7 +489,10 @@ class SubBase(object):
 
         meth = getattr(logging, lvl)
         testname = cls.__name__
-        return meth("%s%s: %s" % ("\t" * cls.n_tabs, testname, msg), *args)
+        # Identifies messages from concurrently running threads
+        prefix = getattr(THREAD_LOCAL, 'log_prefix', '')
+        return meth("%s%s%s: %s" % ("\t" * cls.n_tabs, prefix, testname, msg),
+                    *args)
 
     @classmethod
     def log_xn(cls, lvl, msg, *args):
@@ -350,7 +504,8 @@ class SubBase(object):
         """
         # date, loglevel, this module offset
         newline = '\n' + ' ' * cls.n_spaces + '\t' * cls.n_tabs
-        newline += " " * (len(cls.__name__) + 2)    # cls name + ': '
+        prefix = getattr(THREAD_LOCAL, 'log_prefix', '')
+        newline += " " * (len(prefix) + len(cls.__name__) + 2)  # + ': '
         try:
             msg = (str(msg) % args).replace('\n', newline)
         except TypeError:
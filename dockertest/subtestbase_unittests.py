@@ -150,7 +150,7 @@ docker-1.12.4-*              docker_cli/othersubtest      fixed in 1.12.5
         value and that it emits the expected warning messages (if any).
         """
         self.write_known_failures_file()
-        self.subtestbase.docker_rpm = lambda: nvra
+        self.subtestbase.cached_docker_rpm = lambda: nvra
         self.stbsb.config_section = subtest
 
         # is_known_failure() returns only True/False, but it will log
@@ -258,6 +258,107 @@ docker-1.12.4-*              docker_cli/othersubtest      fixed in 1.12.5
         self._run_test('doesnt/matter', 'docker-1.2.3-4.fc5', False,
                        "Bad row in %s: a b" % self.tmpfile)
 
+    def test_parse_once(self):
+        """
+        File is parsed only once, until it changes
+        """
+        self.write_known_failures_file()
+        parsed = []
+        known_failures = self.subtestbase.known_failures
+
+        def counting_known_failures():
+            parsed.append(True)
+            return known_failures()
+        self.subtestbase.known_failures = counting_known_failures
+        try:
+            index = self.subtestbase.KnownFailuresIndex
+            self.assertEqual(index.get(), index.get())
+            self.assertEqual(len(parsed), 1)
+            nvrs = index.get()['docker_cli/othersubtest']
+            self.assertEqual(nvrs['nv_wild'],
+                             {'docker-1.12.4': 'fixed in 1.12.5'})
+            self.assertEqual(nvrs['nv_base'], set(['docker-1.12']))
+            # Changing the file is noticed
+            with open(self.tmpfile, 'a') as fh:
+                fh.write("docker-1.13.1-1  docker_cli/new  new reason\n")
+            self.assertTrue('docker_cli/new' in index.get())
+            self.assertEqual(len(parsed), 2)
+        finally:
+            self.subtestbase.known_failures = known_failures
+
+
+class TestLogPrefix(TestCase):
+    """
+    Tests for per-thread log message prefix
+    """
+
+    def setUp(self):
+        import subtestbase
+        self.subtestbase = subtestbase
+        self.messages = []
+        self.info = self.subtestbase.logging.info
+        self.subtestbase.logging.info = self.messages.append
+
+    def tearDown(self):
+        self.subtestbase.logging.info = self.info
+        self.subtestbase.THREAD_LOCAL.log_prefix = ''
+
+    def test_prefix(self):
+        self.subtestbase.SubBase.loginfo("foo")
+        self.subtestbase.THREAD_LOCAL.log_prefix = '[bar] '
+        self.subtestbase.SubBase.loginfo("foo")
+        self.assertEqual(self.messages,
+                         ["\tSubBase: foo", "\t[bar] SubBase: foo"])
+
+    def test_other_thread(self):
+        import threading
+        self.subtestbase.THREAD_LOCAL.log_prefix = '[bar] '
+        thread = threading.Thread(target=self.subtestbase.SubBase.loginfo,
+                                  args=("foo",))
+        thread.start()
+        thread.join()
+        self.assertEqual(self.messages, ["\tSubBase: foo"])
+
+
+class TestStageTimes(TestCase):
+    """
+    Tests for per-stage timing
+    """
+
+    def setUp(self):
+        import subtestbase
+        self.written = []
+
+        class Timed(subtestbase.SubBase):
+            # Don't need base-class behavior
+            def run_once(inner):
+                inner.stuff['run'] = self.func_name_of(inner.run_once)
+
+            def cleanup(inner):
+                raise ValueError()
+
+            def write_stage_times(inner):
+                self.written.append(list(inner.stage_times))
+
+        self.timed = Timed()
+
+    @staticmethod
+    def func_name_of(method):
+        return method.func_name
+
+    def test_stage_times(self):
+        self.timed.run_once()
+        self.assertEqual(self.timed.stuff['run'], 'run_once')
+        self.assertRaises(ValueError, self.timed.cleanup)
+        self.assertEqual([record['stage']
+                          for record in self.timed.stage_times],
+                         ['run_once', 'cleanup'])
+        for record in self.timed.stage_times:
+            self.assertTrue(record['wall'] >= 0)
+            self.assertTrue(record['cpu'] >= 0)
+        # Written once, after cleanup (even though it raised)
+        self.assertEqual(self.written, [self.timed.stage_times])
+
 
 class TestFailIfNotIn(TestCase):
     """
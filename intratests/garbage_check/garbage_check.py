@@ -17,6 +17,11 @@ Prerequisites
 ---------------
 
 Customized configuration listing expected containers and images.
+
+Since every test already removes and reports what it leaked, when the
+``leak_check`` option is enabled (the default), this intratest is
+only needed as an occasional deep-scan.  It may be skipped with the
+``x=garbage_check`` control argument.
 """
 
 from dockertest.subtest import SubSubtestCaller
@@ -84,6 +89,55 @@ class DockerImageIncomplete(DockerImage):
         return fqin_score > 0
 
 
+class ImageInventory(object):
+
+    """
+    Single ``list_imgs()`` snapshot, indexed by repo name, long & short ID
+
+    :param image_list: List of DockerImage-like instances
+    """
+
+    def __init__(self, image_list):
+        self.images = image_list
+        self.by_repo = {}
+        self.by_long_id = {}
+        self.by_short_id = {}
+        for img in image_list:
+            self.by_repo.setdefault(img.repo, []).append(img)
+            self.by_long_id.setdefault(img.long_id, []).append(img)
+            self.by_short_id.setdefault(img.short_id, []).append(img)
+        # Can't be compared by ID, see DockerImageIncomplete.cmp_id()
+        self.unknown_ids = self.by_long_id.get(DockerImageIncomplete.UNKNOWN,
+                                               [])
+
+    def with_full_name(self, fqin):
+        """
+        Same result as ``DockerImages.filter_list_full_name(images, fqin)``
+        """
+        (repo, tag,
+         repo_addr,
+         user) = DockerImageIncomplete.split_to_component(fqin)
+        if repo is None:
+            candidates = self.images
+        else:
+            candidates = self.by_repo.get(repo, [])
+        return [img for img in candidates
+                if img.cmp_greedy(repo, tag, repo_addr, user)]
+
+    def with_image_id(self, image_id):
+        """
+        Same result as ``DockerImages.list_imgs_with_image_id(image_id)``
+
+        :raises RuntimeError: If any image's ID is unknown
+        """
+        for img in self.unknown_ids:
+            img.cmp_id(image_id)  # Raises
+        # Same rule as DockerImage.cmp_id()
+        if len(image_id) == 12:
+            return list(self.by_short_id.get(image_id, []))
+        return list(self.by_long_id.get(image_id, []))
+
+
 class garbage_check(SubSubtestCaller):
     # This runs between EVERY subtest, okay, to be more quiet.
     step_log_msgs = {}
@@ -100,7 +154,7 @@ class Base(SubSubtest):
     step_log_msgs = {}
 
     def fuzzy_img(self, fqin_or_id):
-        di = self.sub_stuff['di']
+        inventory = self.sub_stuff['inventory']
         repo = None
         tag = None
         repo_addr = None
@@ -111,8 +165,7 @@ class Base(SubSubtest):
         size = None
         if DockerImageIncomplete.prob_is_fqin(fqin_or_id):
             # Greedy match (i.e. doesn't compare None values)
-            imgs = di.filter_list_full_name(di.list_imgs(),
-                                            fqin_or_id)
+            imgs = inventory.with_full_name(fqin_or_id)
             if len(imgs) == 1:  # found it
                 return imgs[0]
             # Retrieve known infos
@@ -120,7 +173,7 @@ class Base(SubSubtest):
              repo_addr,
              user) = DockerImageIncomplete.split_to_component(fqin_or_id)
         else:
-            imgs = di.list_imgs_with_image_id(fqin_or_id)
+            imgs = inventory.with_image_id(fqin_or_id)
             if len(imgs) == 1:  # found it
                 return imgs[0]
             if len(fqin_or_id) == 12:
@@ -141,6 +194,9 @@ class Base(SubSubtest):
         self.sub_stuff['dc'] = DockerContainers(self)
         self.sub_stuff['di'] = di = DockerImages(self)
         di.DICLS = DockerImageIncomplete
+        # Only re-listed by list_imgs() after removals
+        self.sub_stuff['inventory'] = ImageInventory(di.list_imgs())
+        self.sub_stuff['removed_images'] = False
 
         default_image = self.fuzzy_img(di.default_image)
         self.sub_stuff['default_image'] = default_image
@@ -156,6 +212,16 @@ class Base(SubSubtest):
         self.sub_stuff['fail_containers'] = False
         self.sub_stuff['fail_images'] = False
 
+    def list_imgs(self):
+        """
+        Return images from inventory, refreshed if any were removed since
+        """
+        if self.sub_stuff['removed_images']:
+            di = self.sub_stuff['di']
+            self.sub_stuff['inventory'] = ImageInventory(di.list_imgs())
+            self.sub_stuff['removed_images'] = False
+        return self.sub_stuff['inventory'].images
+
     def postprocess(self):
         super(Base, self).postprocess()
         dc = self.sub_stuff['dc']
@@ -167,9 +233,8 @@ class Base(SubSubtest):
                                % leftover_containers)
             self.sub_stuff['fail_containers'] = fail_containers
 
-        di = self.sub_stuff['di']
         preserve_images = self.sub_stuff['preserve_images']
-        leftover_images = [img for img in di.list_imgs()
+        leftover_images = [img for img in self.list_imgs()
                            if img not in preserve_images]
         if leftover_images:
             fail_images = ("Found leftover images "
@@ -219,7 +284,7 @@ class images(Base):
         preserve_images = self.sub_stuff['preserve_images']
         di = self.sub_stuff['di']
         di.remove_args = '--force=true'
-        leftover_images = [img for img in di.list_imgs()
+        leftover_images = [img for img in self.list_imgs()
                            if img not in preserve_images]
         for img in leftover_images:
             # another sub-subtest will take care of <none> images
@@ -228,6 +293,7 @@ class images(Base):
             if not self.config['remove_garbage']:
                 continue
             self.logwarning("Removing left behind: %s", img)
+            self.sub_stuff['removed_images'] = True
             try:
                 di.remove_image_by_image_obj(img)
             except (ValueError, KeyError):
@@ -254,7 +320,7 @@ class nones(Base):
         preserve_images = self.sub_stuff['preserve_images']
         di = self.sub_stuff['di']
         di.remove_args = '--force=true'
-        leftover_images = [img for img in di.list_imgs()
+        leftover_images = [img for img in self.list_imgs()
                            if img not in preserve_images]
         for img in leftover_images:
             if img.repo is not None and img.repo and img.repo != '<none>':
@@ -262,6 +328,7 @@ class nones(Base):
             if not self.config['remove_garbage']:
                 continue
             self.logwarning("Removing leftover <none> image: %s", img)
+            self.sub_stuff['removed_images'] = True
             try:
                 di.remove_image_by_id(img.short_id)
             except (ValueError, KeyError):
@@ -271,9 +338,8 @@ class nones(Base):
 
     def postprocess(self):
         # No super-call, this method is different
-        di = self.sub_stuff['di']
         preserve_images = self.sub_stuff['preserve_images']
-        leftover_images = [img for img in di.list_imgs()
+        leftover_images = [img for img in self.list_imgs()
                            if (img not in preserve_images and
                                img.repo == '' or img.repo is None)]
         if leftover_images:
@@ -0,0 +1,78 @@
+# -*- python -*-
+#
+# Tests for the docker-autotest 'garbage_check' intratest
+#
+# RUNNING: see run_unittests.sh in the top level of docker-autotest
+#
+from unittest2 import TestCase, main        # pylint: disable=unused-import
+import autotest  # pylint: disable=unused-import
+import garbage_check
+from dockertest.images import DockerImages
+
+
+def long_id(char):
+    return char * 64
+
+
+class TestImageInventory(TestCase):
+
+    def setUp(self):
+        incomplete = garbage_check.DockerImageIncomplete
+        self.images = [
+            incomplete('docker.io/stevedore/fedora', 'latest', long_id('a'),
+                       None, None),
+            incomplete('fedora', '25', long_id('b'), None, None),
+            # Same image, different name
+            incomplete('fedora', 'latest', long_id('b'), None, None),
+            incomplete(None, None, 'sha256:' + long_id('c'),
+                       None, None),
+            incomplete('busybox', 'latest', long_id('d'), None, None)]
+        self.inventory = garbage_check.ImageInventory(self.images)
+
+    def by_id(self, image_id):
+        """Same lookup as before ImageInventory was used"""
+        return [img for img in self.images if img.cmp_id(image_id)]
+
+    def by_name(self, fqin):
+        """Same lookup as before ImageInventory was used"""
+        return DockerImages.filter_list_full_name(self.images, fqin)
+
+    def test_full_id(self):
+        for image_id in (long_id('a'), long_id('b'), 'sha256:' + long_id('c'),
+                         long_id('c'), long_id('e')):
+            self.assertEqual(self.inventory.with_image_id(image_id),
+                             self.by_id(image_id))
+        self.assertEqual(len(self.inventory.with_image_id(long_id('b'))), 2)
+
+    def test_short_id(self):
+        for image_id in ('aaaaaaaaaaaa', 'bbbbbbbbbbbb', 'cccccccccccc',
+                         'eeeeeeeeeeee'):
+            self.assertEqual(self.inventory.with_image_id(image_id),
+                             self.by_id(image_id))
+        self.assertEqual(self.inventory.with_image_id('cccccccccccc'),
+                         [self.images[3]])
+
+    def test_name(self):
+        for fqin in ('fedora', 'fedora:25', 'fedora:latest', 'busybox',
+                     'docker.io/stevedore/fedora:latest',
+                     'stevedore/fedora', 'nothere:latest'):
+            self.assertEqual(self.inventory.with_full_name(fqin),
+                             self.by_name(fqin), fqin)
+        self.assertEqual(len(self.inventory.with_full_name('fedora')), 3)
+
+    def test_unknown_id(self):
+        self.images.append(garbage_check.DockerImageIncomplete(
+            'foo', 'bar', None, None, None))
+        self.inventory = garbage_check.ImageInventory(self.images)
+        self.assertRaises(RuntimeError, self.by_id, long_id('a'))
+        self.assertRaises(RuntimeError, self.inventory.with_image_id,
+                          long_id('a'))
+        self.assertRaises(RuntimeError, self.inventory.with_image_id,
+                          'aaaaaaaaaaaa')
+        # Names can still be compared
+        self.assertEqual(self.inventory.with_full_name('foo:bar'),
+                         self.images[-1:])
+
+
+if __name__ == '__main__':
+    main()
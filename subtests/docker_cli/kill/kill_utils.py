@@ -1,5 +1,6 @@
 """
-Utils for ``docker kill`` related tests.
+Utils for ``docker kill`` related tests, signal delivery is verified by
+``dockertest.signals``.
 :warning: Keep all of these in sync; currently known users:
           ``kill,kill_stopped,kill_stress,kill_parallel_stress``
 """
@@ -12,46 +13,13 @@ import itertools
 import os
 import random
 import time
-from autotest.client.shared.utils import wait_for
 from dockertest import config, subtest, xceptions
 from dockertest.containers import DockerContainers
 from dockertest.dockercmd import AsyncDockerCmd, DockerCmd
 from dockertest.images import DockerImages
 from dockertest.output import OutputGood, mustpass
 from dockertest.images import DockerImage
-
-
-SIGNAL_MAP = {1: 'HUP', 2: 'INT', 3: 'QUIT', 4: 'ILL', 5: 'TRAP', 6: 'ABRT',
-              7: 'BUS', 8: 'FPE', 9: 'KILL', 10: 'USR1', 11: 'SEGV',
-              12: 'USR2', 13: 'PIPE', 14: 'ALRM', 15: 'TERM', 16: 'STKFLT',
-              17: 'CHLD', 18: 'CONT', 19: 'STOP', 20: 'TSTP', 21: 'TTIN',
-              22: 'TTOU', 23: 'URG', 24: 'XCPU', 25: 'XFSZ', 26: 'VTALRM',
-              27: 'PROF', 28: 'WINCH', 29: 'IO', 30: 'PWR', 31: 'SYS'}
-
-
-class Output(object):   # only containment pylint: disable=R0903
-
-    """
-    Wraps object with `.stdout` method and returns only new chars out of it
-    """
-
-    def __init__(self, stuff, idx=None):
-        self.stuff = stuff
-        if idx is None:
-            self.idx = len(stuff.stdout.splitlines())
-        else:
-            self.idx = idx
-
-    def get(self, idx=None):
-        """
-        :param idx: Override last index
-        :return: Output of stuff.stdout from idx (or last read)
-        """
-        if idx is None:
-            idx = self.idx
-        out = self.stuff.stdout.splitlines()
-        self.idx = len(out)
-        return out[idx:]
+from dockertest.signals import SIGNAL_MAP, SignalVerifier
 
 
 class kill_base(subtest.SubSubtest):
@@ -219,19 +187,26 @@ class kill_base(subtest.SubSubtest):
         self.sub_stuff['signals_sequence'] = signals_sequence
         self.sub_stuff['kill_cmds'] = kill_cmds
 
-    def fail_missing(self, check, stopped_log, container_out, line):
-        """Expected signal missing, log details, fail the test"""
-        idx = container_out.idx
-        msg = ("Not all signals were handled inside container "
-               "after SIGCONT execution.\nExpected output "
-               "(unordered):\n  %s\nActual container output:\n"
-               "  %s\nFirst missing line:\n  %s"
-               % ("\n  ".join([check % sig for sig in stopped_log]),
-                  "\n  ".join(container_out.get(idx)), line))
+    def fail_missing(self, verifier, missing):
+        """Expected signal(s) missing, log details, fail the test"""
+        msg = ("Not all signals were handled inside container.\n"
+               "Missing output:\n  %s\nActual container output:\n  %s"
+               % ("\n  ".join(missing),
+                  "\n  ".join(verifier.output.lines)))
         self.logdebug(msg)
         raise xceptions.DockerTestFail("Missing Signal(s), see debug "
                                        "log for more details.")
 
+    def log_latencies(self, verifier):
+        """Log summary of signal delivery latencies observed by verifier"""
+        latencies = [seconds for _, seconds in verifier.latencies]
+        self.sub_stuff['signal_latencies'] = verifier.latencies
+        if latencies:
+            self.loginfo("Delivery latency of %d signal(s): min %0.4fs,"
+                         " mean %0.4fs, max %0.4fs", len(latencies),
+                         min(latencies), sum(latencies) / len(latencies),
+                         max(latencies))
+
     def postprocess(self):
         super(kill_base, self).postprocess()
         for kill_result in self.sub_stuff.get('kill_results', []):
@@ -289,58 +264,20 @@ class kill_check_base(kill_base):
                                            "was executed.")
         self.sub_stuff['container_results'] = container_cmd.wait()
 
-    def _check_previous_payload(self, stopped_log, container_out,
-                                timeout, _check):
-        """
-        Checks that all signals from stopped_log are present in container_out
-        """
-        if stopped_log:
-            endtime = time.time() + timeout
-            _idx = container_out.idx
-            line = None
-            out = None
-            while endtime > time.time():
-                try:
-                    out = container_out.get(_idx)
-                    for line in [_check % sig for sig in stopped_log]:
-                        out.remove(line)
-                    break
-                except ValueError:
-                    pass
-            else:
-                self.fail_missing(_check, stopped_log, container_out, line)
-
-    def _check_signal(self, container_out, _check, signal, timeout):
-        """
-        Check container for $signal check output presence
-        """
-        _idx = container_out.idx
-        check = _check % signal
-        output_matches = lambda: check in container_out.get(_idx)
-        # Wait until the signal gets logged
-        if wait_for(output_matches, timeout, step=0) is None:
-            msg = ("Signal %s not handled inside container.\nExpected "
-                   "output:\n  %s\nActual container output:\n  %s"
-                   % (signal, check,
-                      "\n  ".join(container_out.get(_idx))))
-            self.logdebug(msg)
-            raise xceptions.DockerTestFail("Unhandled signal(s), see debug"
-                                           "log for more details")
-
     def run_once(self):
         # Execute the kill command
         super(kill_check_base, self).run_once()
         container_cmd = self.sub_stuff['container_cmd']
-        container_out = Output(container_cmd)
+        verifier = SignalVerifier(container_cmd, self.config['check_stdout'])
         kill_cmds = self.sub_stuff['kill_cmds']
         signals_sequence = self.sub_stuff['signals_sequence']
-        _check = self.config['check_stdout']
         timeout = self.config['stress_cmd_timeout']
         self.sub_stuff['kill_results'] = []
         stopped_log = None
         _container_pid = container_cmd.process_id
         self.loginfo("Running kill sequence...")
         for cmd, signal in itertools.izip(kill_cmds, signals_sequence):
+            sent = time.time()
             self._execute_command(cmd, signal, _container_pid)
             if signal == -1:    # Bad signal, no other checks
                 continue
@@ -350,16 +287,23 @@ class kill_check_base(kill_base):
                 if stopped_log is None:
                     stopped_log = set()
             elif signal == 18:  # SIGCONT, check previous payload
-                self._check_previous_payload(stopped_log, container_out,
-                                             timeout, _check)
+                # Pending signals are delivered in no particular order
+                missing = verifier.wait(timeout, ordered=False)
+                if missing:
+                    self.fail_missing(verifier, missing)
                 stopped_log = None
             elif stopped_log is not None:  # if not false it's set()
-                if cmd is not False:
+                if cmd is not False and signal not in stopped_log:
                     # Using docker kill: signals are forwarded when the cont
-                    #                    is ready
+                    #                    is ready, same signal only once.
                     # disable E1101, when stopped_log is not False, it's []
                     stopped_log.add(signal)  # pylint: disable=E1101
+                    verifier.expect(signal, sent)
                 # else: using proxy:  signals are not forwarded by proxy, when
                 #                     proxy is SIGSTOPped.
             else:   # normal signal should be logged in container
-                self._check_signal(container_out, _check, signal, timeout)
+                verifier.expect(signal, sent)
+                missing = verifier.wait(timeout)
+                if missing:
+                    self.fail_missing(verifier, missing)
+        self.log_latencies(verifier)
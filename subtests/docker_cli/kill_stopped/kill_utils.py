@@ -0,0 +1 @@
+../kill/kill_utils.py
\ No newline at end of file
@@ -11,14 +11,25 @@ Operational Summary
 2. execute ``docker kill`` (or kill $PID) for each signal in
    ``signals_sequence`` one after another without delay (using bash for loop)
 3. analyze results
+4. (``benchmark`` only) send ``bench_signal_count`` signals by each of
+   ``bench_methods``, one at a time, recording delivery latency and
+   signals/second as perf keyvals.
+
+The ``benchmark`` sub-subtest is not run by default, add it to the
+``subsubtests`` option in a custom configuration to enable it.
 """
 import os
 import time
 
 from autotest.client import utils
-from dockertest import xceptions, subtest
+from dockertest import docker_daemon, xceptions, subtest
+from dockertest.benchmark import latency_keyvals
+from dockertest.config import get_as_list
+from dockertest.containers import DockerContainers
 from dockertest.dockercmd import DockerCmd
-from kill_utils import kill_base, SIGNAL_MAP, Output
+from dockertest.output import mustpass
+from dockertest.signals import SignalVerifier
+from kill_utils import kill_base, SIGNAL_MAP
 
 
 class kill_stress(subtest.SubSubtestCaller):
@@ -102,33 +113,13 @@ class stress(kill_base):
         self.logdebug("kill_command: %s", cmd)
         self.logdebug("signals_sequence: %s", " ".join(sequence))
 
-    def run_once(self):
-        # Execute the kill command
-        kill_base.run_once(self)
+    def _kill_dash_nine(self, kill_cmd):
+        """
+        Destroy the container with kill_cmd, or directly with -9 if False
+        """
         container_cmd = self.sub_stuff['container_cmd']
-        kill_cmds = self.sub_stuff['kill_cmds']
-        signals_set = self.sub_stuff['signals_set']
-        timeout = self.config['stress_cmd_timeout']
-        _check = self.config['check_stdout']
-        self.sub_stuff['kill_results'] = [utils.run(kill_cmds[0],
-                                                    verbose=True)]
-        endtime = time.time() + timeout
-        line = None
-        out = None
-        while endtime > time.time():
-            try:
-                out = container_cmd.stdout.splitlines()
-                for line in [_check % sig for sig in signals_set]:
-                    out.remove(line)
-                break
-            except ValueError:
-                pass
-        else:
-            self.fail_missing(_check, signals_set, Output(container_cmd, 0),
-                              line)
-        # Kill -9
-        if kill_cmds[1] is not False:   # Custom kill command
-            self.sub_stuff['kill_results'].append(kill_cmds[1].execute())
+        if kill_cmd is not False:   # Custom kill command
+            self.sub_stuff['kill_results'].append(kill_cmd.execute())
         else:   # kill the container process
             os.kill(container_cmd.process_id, 9)
         for _ in xrange(50):
@@ -141,6 +132,26 @@ class stress(kill_base):
                                            "was executed.")
         self.sub_stuff['container_results'] = container_cmd.wait()
 
+    def run_once(self):
+        # Execute the kill command
+        kill_base.run_once(self)
+        container_cmd = self.sub_stuff['container_cmd']
+        kill_cmds = self.sub_stuff['kill_cmds']
+        signals_set = self.sub_stuff['signals_set']
+        timeout = self.config['stress_cmd_timeout']
+        verifier = SignalVerifier(container_cmd, self.config['check_stdout'])
+        sent = time.time()
+        self.sub_stuff['kill_results'] = [utils.run(kill_cmds[0],
+                                                    verbose=True)]
+        # Same signal sent repeatedly may be handled only once, in any order
+        for signal in signals_set:
+            verifier.expect(signal, sent)
+        missing = verifier.wait(timeout, ordered=False)
+        if missing:
+            self.fail_missing(verifier, missing)
+        self.log_latencies(verifier)
+        self._kill_dash_nine(kill_cmds[1])
+
 
 class stress_ttyoff(stress):
 
@@ -158,3 +169,107 @@ class attach_sigproxy_stress_ttyoff(stress):
 
     """ non-tty variant of the attach_sigproxy_stress test """
     tty = False
+
+
+class benchmark(stress):
+
+    """
+    Measure signal delivery latency and throughput (not only correctness)
+
+    initialize:
+    1) start container waiting in bash ``wait`` so handlers run immediately
+    run_once:
+    2) for each of ``bench_methods`` send ``bench_signal_count`` signals,
+       waiting for each handler's output before sending the next.
+    3) sends docker kill -9 and verifies docker was killed
+    postprocess:
+    4) write latency percentiles and signals/second as perf keyvals
+    """
+    tty = False
+
+    def _populate_kill_cmds(self, extra_subargs):
+        self.sub_stuff['kill_cmds'] = [None, DockerCmd(self, 'kill',
+                                                       extra_subargs)]
+        self.sub_stuff['kill_subargs'] = extra_subargs
+
+    def _send_docker_kill(self, signal):
+        """Send signal using ``docker kill``"""
+        subargs = ["-s %d" % signal] + self.sub_stuff['kill_subargs']
+        mustpass(DockerCmd(self, 'kill', subargs).execute())
+
+    def _send_api(self, signal):
+        """Send signal using daemon API ``/containers/{id}/kill``"""
+        response = self.sub_stuff['client'].post(
+            '/containers/%s/kill?signal=%d'
+            % (self.sub_stuff['container_name'], signal))
+        body = response.read()  # Required before re-using connection
+        if response.status != 204:
+            raise xceptions.DockerTestFail("Daemon API kill returned %s: %s"
+                                           % (response.status, body))
+
+    def _send_pid(self, signal):
+        """Send signal directly to container's main process"""
+        os.kill(self.sub_stuff['container_pid'], signal)
+
+    def _bench_method(self, method, verifier, signals, count, timeout):
+        """
+        Send count signals (cycling through signals) using method, waiting
+        for each handler's output before sending the next.
+
+        :return: Tuple of list of latency seconds, and total elapsed seconds
+        """
+        send = getattr(self, '_send_%s' % method)
+        first = len(verifier.latencies)
+        start = time.time()
+        for index in xrange(count):
+            signal = signals[index % len(signals)]
+            sent = time.time()
+            send(signal)
+            # One at a time, pending signals of same number coalesce
+            verifier.expect(signal, sent)
+            missing = verifier.wait(timeout)
+            if missing:
+                self.fail_missing(verifier, missing)
+        elapsed = time.time() - start
+        latencies = [seconds for _, seconds in verifier.latencies[first:]]
+        return (latencies, elapsed)
+
+    def run_once(self):
+        kill_base.run_once(self)
+        name = self.sub_stuff['container_name']
+        self.sub_stuff['kill_results'] = []
+        self.sub_stuff['client'] = docker_daemon.SocketClient()
+        dc = DockerContainers(self)
+        self.sub_stuff['container_pid'] = int(
+            dc.json_by_name(name)[0]['State']['Pid'])
+        verifier = SignalVerifier(self.sub_stuff['container_cmd'],
+                                  self.config['check_stdout'])
+        signals = [int(sig) for sig in self.config['bench_signals'].split()]
+        count = int(self.config['bench_signal_count'])
+        self.sub_stuff['bench_results'] = {}
+        for method in get_as_list(self.config['bench_methods']):
+            latencies, elapsed = self._bench_method(
+                method, verifier, signals, count,
+                self.config['stress_cmd_timeout'])
+            self.sub_stuff['bench_results'][method] = (latencies, elapsed)
+            self.loginfo("%s: %d signals in %0.2fs (%0.1f/s)", method,
+                         count, elapsed, count / elapsed)
+        self._kill_dash_nine(self.sub_stuff['kill_cmds'][1])
+
+    def postprocess(self):
+        super(benchmark, self).postprocess()
+        perf = {}
+        for method, (latencies, elapsed) in sorted(
+                self.sub_stuff.get('bench_results', {}).items()):
+            keyvals = latency_keyvals('%s.%s' % (self.__class__.__name__,
+                                                 method),
+                                      latencies, elapsed)
+            for key in sorted(keyvals):
+                self.logdebug("%s = %s", key, keyvals[key])
+            perf.update(keyvals)
+        self.parent_subtest.write_perf_keyval(perf)
+
+    def cleanup(self):
+        if self.sub_stuff.get('client') is not None:
+            self.sub_stuff['client'].close()
+        super(benchmark, self).cleanup()
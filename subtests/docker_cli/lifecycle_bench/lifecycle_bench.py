@@ -0,0 +1,193 @@
+r"""
+Summary
+---------
+
+Measure how quickly the daemon creates, starts, waits on, and removes
+containers, at increasing concurrency.
+
+Operational Summary
+----------------------
+
+#. For each ``concurrency`` level, run ``cycles_per_level`` container
+   lifecycles (``docker create``, ``start``, ``wait``, then ``rm``) on
+   that many concurrent threads.
+#. Verify every command succeeded, and containers exited zero.
+#. Write cycles/second and p50/p95/p99 latency of each phase, and of
+   complete cycles, as perf keyvals.
+#. Fail if cycles/second at any level is below ``min_cycles_per_sec``.
+
+Operational Detail
+----------------------
+
+Perf keyvals are named ``c<concurrency>.<phase>_<statistic>`` where
+phase is ``create``, ``start``, ``wait``, ``rm`` or ``cycle``, e.g.
+``c16.start_p95`` or ``c64.cycle_per_sec``.  Each phase's latency
+includes ``docker`` client start-up, as experienced by users.
+
+Prerequisites
+---------------
+
+The default test image is available locally.  This subtest is excluded
+by default, remove ``docker_cli/lifecycle_bench`` from the ``exclude``
+option in ``config_custom/control.ini`` to run it.
+"""
+
+import Queue
+import threading
+import time
+from dockertest import subtest
+from dockertest.benchmark import latency_keyvals
+from dockertest.config import get_as_list
+from dockertest.containers import DockerContainers
+from dockertest.dockercmd import DockerCmd
+from dockertest.images import DockerImage
+
+
+class lifecycle_bench(subtest.Subtest):
+
+    #: Order of docker subcommands in each container's lifecycle
+    phases = ('create', 'start', 'wait', 'rm')
+
+    def initialize(self):
+        super(lifecycle_bench, self).initialize()
+        levels = [int(level)
+                  for level in get_as_list(self.config['concurrency'])]
+        floors = [float(floor)
+                  for floor in get_as_list(self.config['min_cycles_per_sec'])]
+        if len(floors) == 1:
+            floors *= len(levels)
+        if len(floors) != len(levels):
+            raise ValueError("min_cycles_per_sec must have one value, or one"
+                             " for each concurrency level")
+        self.stuff['floors'] = dict(zip(levels, floors))
+        self.stuff['levels'] = levels
+        self.stuff['fqin'] = DockerImage.full_name_from_defaults(self.config)
+        # One (expensive) lookup, cycle number makes each name unique
+        dc = DockerContainers(self)
+        self.stuff['prefix'] = dc.get_unique_name(self.__class__.__name__)
+        # Names of containers created, but not yet removed
+        self.stuff['containers'] = set()
+        self.stuff['results'] = {}
+
+    def docker(self, subcmd, subargs):
+        """Return CmdResult of quietly executing docker subcmd"""
+        return DockerCmd(self, subcmd, subargs, verbose=False).execute()
+
+    def cycle(self, name, durations):
+        """
+        Create, start, wait for, then remove container name
+
+        :param name: Unique container name
+        :param durations: Dictionary of phase to list of seconds to append to
+        :return: None on success, or a string describing the failure
+        """
+        subargs = {'create': ['--name', name, self.stuff['fqin']] +
+                             [self.config['container_cmd']],
+                   'start': [name],
+                   'wait': [name],
+                   'rm': [name]}
+        for phase in self.phases:
+            if phase == 'create':
+                self.stuff['containers'].add(name)
+            result = self.docker(phase, subargs[phase])
+            if result.exit_status != 0:
+                return ("%s failed with exit %s: %s"
+                        % (result.command, result.exit_status,
+                           result.stderr.strip()))
+            if phase == 'wait' and result.stdout.strip() != '0':
+                return ("Container %s exited %s"
+                        % (name, result.stdout.strip()))
+            if phase == 'rm':
+                self.stuff['containers'].discard(name)
+            # list.append() is atomic, don't need a lock
+            durations[phase].append(result.duration)
+        return None
+
+    def worker(self, pending, durations, errors):
+        """Run cycles for names in pending Queue until empty"""
+        while True:
+            try:
+                name = pending.get_nowait()
+            except Queue.Empty:
+                return
+            start = time.time()
+            # Catching general exception, it must not kill this worker
+            # and is reported along with other failures.
+            # pylint: disable=W0703
+            try:
+                error = self.cycle(name, durations)
+            except Exception, xcept:
+                error = "%s: %s" % (name, xcept)
+            if error is not None:
+                errors.append(error)
+            else:
+                durations['cycle'].append(time.time() - start)
+
+    def run_level(self, level):
+        """
+        Run ``cycles_per_level`` cycles on level concurrent threads
+
+        :return: Tuple of elapsed seconds, phase durations dict, error list
+        """
+        pending = Queue.Queue()
+        for number in xrange(max(int(self.config['cycles_per_level']),
+                                 level)):
+            pending.put('%s_c%d_%d' % (self.stuff['prefix'], level, number))
+        durations = dict((phase, []) for phase in self.phases + ('cycle',))
+        errors = []
+        workers = [threading.Thread(target=self.worker,
+                                    args=(pending, durations, errors),
+                                    name='%s_%d' % (self.config_section,
+                                                    num))
+                   for num in xrange(level)]
+        start = time.time()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return (time.time() - start, durations, errors)
+
+    def run_once(self):
+        super(lifecycle_bench, self).run_once()
+        for level in self.stuff['levels']:
+            self.loginfo("Running container lifecycles %d at a time", level)
+            elapsed, durations, errors = self.run_level(level)
+            self.stuff['results'][level] = (elapsed, durations, errors)
+            self.loginfo("%d cycles in %0.2fs (%0.2f/s), %d failed",
+                         len(durations['cycle']), elapsed,
+                         len(durations['cycle']) / elapsed, len(errors))
+
+    def postprocess(self):
+        super(lifecycle_bench, self).postprocess()
+        perf = {}
+        failures = []
+        for level in self.stuff['levels']:
+            elapsed, durations, errors = self.stuff['results'][level]
+            for error in errors:
+                self.logerror("%s", error)
+            for phase in self.phases + ('cycle',):
+                keyvals = latency_keyvals('c%d.%s' % (level, phase),
+                                          durations[phase], elapsed)
+                perf.update(keyvals)
+                if durations[phase]:
+                    self.loginfo("concurrency %d %s: %0.2f/s p50 %0.3fs"
+                                 " p95 %0.3fs p99 %0.3fs", level, phase,
+                                 keyvals['c%d.%s_per_sec' % (level, phase)],
+                                 keyvals['c%d.%s_p50' % (level, phase)],
+                                 keyvals['c%d.%s_p95' % (level, phase)],
+                                 keyvals['c%d.%s_p99' % (level, phase)])
+            rate = len(durations['cycle']) / elapsed
+            if errors:
+                failures.append("%d cycles failed at concurrency %d"
+                                % (len(errors), level))
+            elif rate < self.stuff['floors'][level]:
+                failures.append("%0.2f cycles/s at concurrency %d is below"
+                                " minimum of %0.2f"
+                                % (rate, level, self.stuff['floors'][level]))
+        self.write_perf_keyval(perf)
+        self.failif(failures, "; ".join(failures))
+
+    def cleanup(self):
+        super(lifecycle_bench, self).cleanup()
+        if self.config['remove_after_test'] and self.stuff.get('containers'):
+            DockerContainers(self).clean_all(self.stuff['containers'])
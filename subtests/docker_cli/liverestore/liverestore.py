@@ -57,7 +57,8 @@ class liverestore(subtest.Subtest):
 
         # Skip test if live-restore is not enabled
         try:
-            lr_enabled = DockerInfo().get('Live Restore Enabled')
+            lr_enabled = DockerInfo(cache=True).get(
+                'Live Restore Enabled')
             self.failif_ne(lr_enabled, 'true',
                            "Live Restore Enabled field from 'docker info'",
                            DockerTestNAError)
@@ -95,7 +96,8 @@ class liverestore(subtest.Subtest):
         self.stuff['dockerd_pid_orig'] = docker_daemon.pid()
         self.stuff['container_pid_orig'] = self._container_pid()
         t0 = time.time()
-        docker_daemon.restart()
+        # Returns once daemon answers & container is known to it again
+        docker_daemon.restart(containers=[self.stuff['container_name']])
         t1 = time.time()
         if t1 - t0 > 30:
             self.logwarning("docker restart took %d seconds", t1 - t0)
@@ -0,0 +1,630 @@
+# -*- python -*-
+
+from unittest2 import TestCase, main
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+# Control file is executed by autotest, not imported, and needs a job
+CONTROL = os.path.abspath('./control')
+
+
+class FakeJob(object):
+
+    """Just enough of autotest's job object for loading the control file"""
+
+    def __init__(self, control_dir, args):
+        self.control = os.path.join(control_dir, 'control')
+        self.resultdir = os.path.join(control_dir, 'results', 'job')
+        self.args = list(args)
+        self.steps = []
+
+    def add_sysinfo_command(self, *args, **dargs):
+        pass
+
+    def next_step_append(self, step):
+        self.steps.append(step)
+
+    def run_test(self, **dargs):
+        pass
+
+
+def load_control(control_dir, args=()):
+    """
+    Return globals from executing control file as if it were in control_dir
+    """
+    job = FakeJob(control_dir, args)
+    if not os.path.isdir(job.resultdir):
+        os.makedirs(job.resultdir)
+    namespace = {'job': job, '__name__': 'control'}
+    with open(CONTROL, 'rb') as control_file:
+        exec compile(control_file.read(), CONTROL, 'exec') in namespace
+    return namespace
+
+
+class ControlTestBase(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.tmpdir, 'config_custom'))
+        self.control = load_control(self.tmpdir)
+        self.control_ini = self.control['ControlINI']()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def path(self, *names):
+        return os.path.join(self.tmpdir, *names)
+
+    def add_subtest(self, name, subsubtests=None):
+        os.makedirs(self.path('subtests', name))
+        modname = os.path.basename(name) + '.py'
+        open(self.path('subtests', name, modname), 'wb').close()
+        if subsubtests is not None:
+            self.write_ini(name, subsubtests)
+
+    def write_ini(self, name, subsubtests, configdir='config_defaults'):
+        ini_path = self.path(configdir, 'subtests', name + '.ini')
+        if not os.path.isdir(os.path.dirname(ini_path)):
+            os.makedirs(os.path.dirname(ini_path))
+        with open(ini_path, 'wb') as ini_file:
+            ini_file.write("[%s]\nsubsubtests = %s\n"
+                           % (name, subsubtests))
+
+
+class FakeBug(object):
+
+    def __init__(self, bug_id, whiteboard):
+        self.bug_id = bug_id
+        self.whiteboard = whiteboard
+
+
+class FakeBugzilla(object):
+
+    """Stand-in for python-bugzilla's Bugzilla class"""
+
+    # Class attributes, a new instance is made for every query
+    queries = []
+    bugs = []
+    broken = False
+
+    def __init__(self, url):
+        self.url = url
+
+    def login(self, user, password):
+        pass
+
+    @staticmethod
+    def build_query(**dargs):
+        return dargs
+
+    def query(self, query):
+        self.queries.append(query)
+        if self.broken:
+            raise IOError("Bugzilla unreachable")
+        return self.bugs
+
+
+class TestBugzillaCache(ControlTestBase):
+
+    def setUp(self):
+        super(TestBugzillaCache, self).setUp()
+        FakeBugzilla.queries = []
+        FakeBugzilla.bugs = [FakeBug(123, 'docker-autotest:docker_cli/foo'),
+                             FakeBug(456, 'docker-autotest:docker_cli/bar/b')]
+        FakeBugzilla.broken = False
+        self.control_ini.set('Bugzilla', 'url', 'http://bz.example.com/')
+        self.control_ini.set('Bugzilla', 'key_field', 'whiteboard')
+        self.control_ini.set('Bugzilla', 'key_match', 'docker-autotest')
+        self.control_ini.set('Bugzilla', 'cache_ttl', '3600')
+        self.expected = {'docker_cli/foo': [123], 'docker_cli/bar/b': [456]}
+
+    def namestobzs(self):
+        # Module is removed from sys.modules after every query
+        bugzilla = types.ModuleType('bugzilla')
+        bugzilla.Bugzilla = FakeBugzilla
+        sys.modules['bugzilla'] = bugzilla
+        try:
+            return self.control_ini.cached_namestobzs()
+        finally:
+            sys.modules.pop('bugzilla', None)
+
+    def age_cache(self, seconds):
+        path = self.control_ini.bz_cache_path
+        with open(path, 'rb') as cache_file:
+            cache = json.load(cache_file)
+        cache['time'] -= seconds
+        with open(path, 'wb') as cache_file:
+            json.dump(cache, cache_file)
+
+    def test_ttl_hit(self):
+        self.assertEqual(self.namestobzs(), self.expected)
+        self.assertTrue(os.path.isfile(self.control_ini.bz_cache_path))
+        self.age_cache(3000)
+        self.assertEqual(self.namestobzs(), self.expected)
+        self.assertEqual(len(FakeBugzilla.queries), 1)
+
+    def test_ttl_expired(self):
+        self.namestobzs()
+        self.age_cache(4000)
+        FakeBugzilla.bugs = FakeBugzilla.bugs[:1]
+        self.assertEqual(self.namestobzs(), {'docker_cli/foo': [123]})
+        self.assertEqual(len(FakeBugzilla.queries), 2)
+        # New results were cached
+        self.assertEqual(self.namestobzs(), {'docker_cli/foo': [123]})
+        self.assertEqual(len(FakeBugzilla.queries), 2)
+
+    def test_stale_on_failure(self):
+        self.namestobzs()
+        self.age_cache(86400)
+        FakeBugzilla.broken = True
+        self.assertEqual(self.namestobzs(), self.expected)
+        self.assertEqual(len(FakeBugzilla.queries), 2)
+
+    def test_failure_no_cache(self):
+        FakeBugzilla.broken = True
+        self.assertEqual(self.namestobzs(), None)
+        self.assertFalse(os.path.isfile(self.control_ini.bz_cache_path))
+
+    def test_ttl_zero(self):
+        self.control_ini.set('Bugzilla', 'cache_ttl', '0')
+        self.assertEqual(self.namestobzs(), self.expected)
+        self.assertEqual(self.namestobzs(), self.expected)
+        self.assertEqual(len(FakeBugzilla.queries), 2)
+        self.assertFalse(os.path.isfile(self.control_ini.bz_cache_path))
+        # Nor is any existing cache used when the query fails
+        self.control_ini.set('Bugzilla', 'cache_ttl', '3600')
+        self.namestobzs()
+        self.control_ini.set('Bugzilla', 'cache_ttl', '0')
+        FakeBugzilla.broken = True
+        self.assertEqual(self.namestobzs(), None)
+
+    def test_key_mismatch(self):
+        self.namestobzs()
+        self.control_ini.set('Query', 'product', 'Fedora')
+        self.assertEqual(self.namestobzs(), self.expected)
+        self.assertEqual(len(FakeBugzilla.queries), 2)
+        self.assertEqual(FakeBugzilla.queries[-1]['product'], 'Fedora')
+        # Cache from a different query isn't used, even when stale
+        self.control_ini.set('Query', 'product', 'RHEL')
+        FakeBugzilla.broken = True
+        self.assertEqual(self.namestobzs(), None)
+
+
+class TestSubtestModules(ControlTestBase):
+
+    NAMES = ['docker_cli/run', 'docker_cli/run/deep', 'docker_cli/run_env',
+             'docker_cli/a/b/c', 'docker_cli/a', 'example', 'x/y']
+
+    @staticmethod
+    def longest_prefix(name, names):
+        """Parent search prior to SubtestModules, for comparison"""
+        while name.count('/') > 1:
+            name = os.path.dirname(name)
+            if name in names:
+                return name
+        return None
+
+    def test_parent(self):
+        modules = self.control['SubtestModules'](self.NAMES)
+        self.assertEqual(list(modules), self.NAMES)
+        self.assertEqual(len(modules), len(self.NAMES))
+        self.assertTrue('docker_cli/run_env' in modules)
+        self.assertFalse('docker_cli/run/foo' in modules)
+        candidates = ['docker_cli/run/foo', 'docker_cli/run/deep/foo',
+                      'docker_cli/run/deep/foo/bar', 'docker_cli/run_env/a',
+                      'docker_cli/a/b', 'docker_cli/a/b/c/d', 'docker_cli/b/c',
+                      'docker_cli/run', 'docker_cli/runx/foo', 'example/foo',
+                      'example/foo/bar', 'x/y/z', 'x/yz/z', 'docker_cli']
+        for name in candidates + self.NAMES:
+            self.assertEqual(modules.parent(name),
+                             self.longest_prefix(name, self.NAMES), name)
+
+    def test_subtest_of_subsubtest(self):
+        subtest_of_subsubtest = self.control['subtest_of_subsubtest']
+        # Plain list or SubtestModules
+        for modules in (self.NAMES, self.control['SubtestModules'](self.NAMES)):
+            self.assertEqual(subtest_of_subsubtest('docker_cli/run/deep/foo',
+                                                   modules),
+                             'docker_cli/run/deep')
+            self.assertEqual(subtest_of_subsubtest('docker_cli/run/deep',
+                                                   modules), None)
+            self.assertEqual(subtest_of_subsubtest('docker_cli/nope/foo',
+                                                   modules), None)
+
+
+class TestSubtestManifest(ControlTestBase):
+
+    SUBDIRS = {'subtests': 'subtests', 'pretests': ''}
+
+    def setUp(self):
+        super(TestSubtestManifest, self).setUp()
+        self.generated = 0
+        test = self
+
+        class Counted(self.control['SubtestManifest']):
+
+            def generate(self):
+                test.generated += 1
+                return super(Counted, self).generate()
+
+        self.manifest_class = Counted
+        self.add_subtest('docker_cli/foo', 'one, two, one')
+        self.add_subtest('docker_cli/bar')
+        self.age()
+
+    def age(self):
+        """Make everything old, so any change is a different mtime"""
+        old = time.time() - 1000
+        for dirpath, _, basenames in os.walk(self.tmpdir):
+            for basename in basenames:
+                os.utime(os.path.join(dirpath, basename), (old, old))
+            os.utime(dirpath, (old, old))
+
+    def manifest(self):
+        return self.manifest_class(self.tmpdir, self.SUBDIRS)
+
+    def test_cached(self):
+        manifest = self.manifest()
+        self.assertEqual(sorted(manifest.modules('subtests')),
+                         ['docker_cli/bar', 'docker_cli/foo'])
+        self.assertEqual(manifest.modules('pretests'), [])
+        self.assertEqual(manifest.subsubtests(),
+                         {'docker_cli/foo': ['one', 'two']})
+        self.assertTrue(os.path.isfile(manifest.path))
+        # Storing manifest (or other caches) doesn't make it stale
+        open(self.path('config_custom', '.other_cache.json'), 'wb').close()
+        self.assertEqual(self.manifest().modules('subtests'),
+                         manifest.modules('subtests'))
+        self.assertEqual(self.generated, 1)
+        # Different directories, different manifest
+        self.manifest_class(self.tmpdir, {'subtests': 'subtests'})
+        self.assertEqual(self.generated, 2)
+
+    def test_added(self):
+        self.manifest()
+        self.add_subtest('docker_cli/baz/qux')
+        self.assertTrue('docker_cli/baz/qux'
+                        in self.manifest().modules('subtests'))
+        self.assertEqual(self.generated, 2)
+
+    def test_removed(self):
+        self.manifest()
+        shutil.rmtree(self.path('subtests', 'docker_cli', 'bar'))
+        self.assertEqual(self.manifest().modules('subtests'),
+                         ['docker_cli/foo'])
+        self.assertEqual(self.generated, 2)
+
+    def test_ini_changed(self):
+        self.manifest()
+        self.write_ini('docker_cli/foo', 'three')
+        self.assertEqual(self.manifest().subsubtests(),
+                         {'docker_cli/foo': ['three']})
+        self.age()
+        self.write_ini('docker_cli/bar', 'four', 'config_custom')
+        self.assertEqual(self.manifest().subsubtests(),
+                         {'docker_cli/foo': ['three'],
+                          'docker_cli/bar': ['four']})
+        self.assertEqual(self.generated, 3)
+
+    def test_corrupt(self):
+        manifest = self.manifest()
+        with open(manifest.path, 'wb') as manifest_file:
+            manifest_file.write('{"version": ')
+        self.assertEqual(self.manifest().modules('subtests'),
+                         manifest.modules('subtests'))
+        self.assertEqual(self.generated, 2)
+
+
+class TestRerun(ControlTestBase):
+
+    FIXTURE = os.path.abspath('test_results2junit.d/02complete')
+
+    STATUS = ("\tSTART\t%(path)s\t%(path)s\ttimestamp=1\tlocaltime=x\n"
+              "\t\t%(status)s\t%(path)s\t%(path)s\ttimestamp=2\t"
+              "localtime=x\t%(message)s\n"
+              "\tEND %(status)s\t%(path)s\t%(path)s\ttimestamp=2\t"
+              "localtime=x\n")
+
+    def results_dir(self, *steps):
+        """
+        Return copy of fixture results, plus steps of (test path, status,
+        message, failed_subsubtests keyval or None)
+        """
+        results_dir = self.path('results', 'previous')
+        shutil.copytree(self.FIXTURE, results_dir)
+        with open(os.path.join(results_dir, 'status'), 'ab') as status:
+            for path, status_word, message, keyval in steps:
+                status.write(self.STATUS % {'path': path,
+                                            'status': status_word,
+                                            'message': message})
+                if keyval is None:
+                    continue
+                os.makedirs(os.path.join(results_dir, path))
+                with open(os.path.join(results_dir, path, 'keyval'),
+                          'wb') as keyval_file:
+                    keyval_file.write("foo=bar\nfailed_subsubtests=%s\n"
+                                      % keyval)
+        return results_dir
+
+    def failed(self, results_dir):
+        return self.control['failed_subthings'](results_dir, 'subtests')
+
+    def test_fixture(self):
+        self.assertEqual(self.failed(self.FIXTURE), ['docker_cli/failtest'])
+
+    def test_keyval(self):
+        results_dir = self.results_dir(
+            ('docker/subtests/docker_cli/run.4', 'ERROR',
+             "Sub-subtest failures: set(['ignored'])", 'b,a'),
+            ('docker/subtests/docker_cli/run.7_1', 'FAIL', 'again', 'c'))
+        self.assertEqual(self.failed(results_dir),
+                         ['docker_cli/failtest', 'docker_cli/run',
+                          'docker_cli/run/b', 'docker_cli/run/a',
+                          'docker_cli/run/c'])
+
+    def test_message(self):
+        results_dir = self.results_dir(
+            ('docker/subtests/docker_cli/run.4', 'FAIL',
+             "Sub-subtest failures: set(['one', 'two'])", None),
+            ('docker/subtests/docker_cli/start.5', 'ABORT', "Timeout", ''),
+            ('docker/subtests/docker_cli/good.6', 'GOOD',
+             "Sub-subtest failures: set(['no'])", None),
+            ('docker/pretests/docker_test_images.0', 'FAIL', "bad", None))
+        self.assertEqual(self.failed(results_dir),
+                         ['docker_cli/failtest', 'docker_cli/run',
+                          'docker_cli/run/one', 'docker_cli/run/two',
+                          'docker_cli/start'])
+
+    def test_rerun_to_control(self):
+        self.assertEqual(self.control_ini.rerun_to_control(['foo']), None)
+        self.assertEqual(self.control_ini.get('Control', 'rerun'), '')
+        rerun = self.control_ini.rerun_to_control(['rerun=results/x/ '])
+        self.assertEqual(rerun, os.path.abspath('results/x'))
+        self.assertEqual(self.control_ini.get('Control', 'rerun'), rerun)
+
+    def test_rerun_subthings(self):
+        results_dir = self.results_dir(
+            ('docker/subtests/docker_cli/run.4', 'FAIL', '', 'a'),
+            ('docker/subtests/docker_cli/gone.5', 'FAIL', '', 'z'))
+        step_init = self.control['step_init']
+        self.assertEqual(step_init.rerun_subthings(results_dir,
+                                                   ['docker_cli/failtest',
+                                                    'docker_cli/run']),
+                         ['docker_cli/failtest', 'docker_cli/run',
+                          'docker_cli/run/a', 'docker_cli/gone',
+                          'docker_cli/gone/z'])
+        # Nothing failed, must not run everything
+        with open(self.path('status'), 'wb') as status:
+            status.write(self.STATUS % {'path': 'docker/subtests/x/y.1',
+                                        'status': 'GOOD', 'message': ''})
+        self.assertEqual(step_init.rerun_subthings(self.tmpdir,
+                                                   ['docker_cli/run']),
+                         [self.control_ini.NOEXECTOK])
+
+    def test_control_ini(self):
+        self.add_subtest('docker_cli/failtest')
+        self.add_subtest('docker_cli/run', 'a, b, c')
+        self.add_subtest('docker_cli/start')
+        results_dir = self.results_dir(
+            ('docker/subtests/docker_cli/run.4', 'FAIL', '', 'b'))
+        control = load_control(self.tmpdir, ['rerun=%s' % results_dir])
+        with open(os.path.join(control['job'].resultdir,
+                               'control.ini'), 'rb') as control_ini:
+            lines = control_ini.read().splitlines()
+        self.assertTrue('rerun = %s' % results_dir in lines)
+        self.assertTrue('subthings = docker_cli/failtest,docker_cli/run,'
+                        'docker_cli/run/b' in lines)
+        self.assertEqual([step.uri for step in control['step_init'].items],
+                         ['%s/subtests/docker_cli/failtest'
+                          % os.path.basename(self.tmpdir),
+                          '%s/subtests/docker_cli/run'
+                          % os.path.basename(self.tmpdir)])
+
+
+class TestShards(ControlTestBase):
+
+    def test_assign_deterministic(self):
+        assign_shards = self.control['assign_shards']
+        units = [(1.0, 'unit%02d' % num) for num in xrange(25)]
+        expected = assign_shards(units, 4)
+        self.assertEqual(assign_shards(list(reversed(units)), 4), expected)
+        self.assertEqual(assign_shards(units[13:] + units[:13], 4), expected)
+
+    def test_assign_all_once(self):
+        assign_shards = self.control['assign_shards']
+        units = [(float(num % 7), 'unit%02d' % num) for num in xrange(30)]
+        for count in (1, 2, 3, 8, 40):
+            assignment = assign_shards(units, count)
+            self.assertEqual(sorted(assignment),
+                             sorted(name for _, name in units))
+            for shard in assignment.values():
+                self.assertTrue(1 <= shard <= count)
+
+    def test_assign_balance(self):
+        assign_shards = self.control['assign_shards']
+        units = [(10.0, 'big'), (5.0, 'medium1'), (5.0, 'medium2'),
+                 (2.5, 'small1'), (2.5, 'small2'), (2.5, 'small3'),
+                 (2.5, 'small4')]
+        assignment = assign_shards(units, 2)
+        loads = [0.0, 0.0]
+        for weight, name in units:
+            loads[assignment[name] - 1] += weight
+        self.assertEqual(loads, [15.0, 15.0])
+        # More shards than units, no shard gets two
+        assignment = assign_shards(units[:3], 5)
+        self.assertEqual(sorted(assignment.values()), [1, 2, 3])
+
+    def test_shard_to_control(self):
+        shard_to_control = self.control_ini.shard_to_control
+        self.assertEqual(shard_to_control([]), None)
+        self.assertEqual(shard_to_control(['shard= 2/3 ']), (2, 3))
+        self.assertEqual(self.control_ini.get('Control', 'shard'), '2/3')
+        self.control_ini.set('Control', 'shard', '1/2')
+        self.assertEqual(shard_to_control([]), (1, 2))
+        # Command-line wins
+        self.assertEqual(shard_to_control(['shard=3/4']), (3, 4))
+        for bad in ('0/2', '3/2', '1/0', '-1/2', 'a/b', '1', '1/2/3', '/'):
+            self.assertRaises(ValueError, shard_to_control, ['shard=' + bad])
+
+    def test_shard_subthings(self):
+        step_init = self.control['step_init']
+        step_init.control_ini._manifest = None
+        self.add_subtest('docker_cli/one')
+        self.add_subtest('docker_cli/two', 'a, b, c, d')
+        self.add_subtest('docker_cli/three')
+        subthings = ['docker_cli/one', 'docker_cli/two', 'docker_cli/three']
+        modules = self.control['SubtestModules'](subthings)
+        every = set()
+        for index in (1, 2):
+            step_init.args = ['shard=%d/2' % index]
+            exclude = []
+            mine = step_init.shard_subthings(list(subthings), exclude,
+                                             modules)
+            # Subtests run on each shard with some of it's sub-subtests
+            self.assertTrue('docker_cli/two' in mine)
+            units = set(mine) - set(['docker_cli/two'])
+            units |= set('docker_cli/two/%s' % name for name in 'abcd'
+                         if 'docker_cli/two/%s' % name not in exclude)
+            self.assertFalse(units & every)
+            every |= units
+        self.assertEqual(every,
+                         set(['docker_cli/one', 'docker_cli/three'] +
+                             ['docker_cli/two/%s' % name for name in 'abcd']))
+
+    def test_shard_weights(self):
+        step_init = self.control['step_init']
+        subtests = ['docker_cli/one', 'docker_cli/two', 'docker_cli/three']
+        self.assertEqual(step_init.shard_weights(subtests, 'count'),
+                         dict((subtest, 1.0) for subtest in subtests))
+        history = self.control['DurationHistory'](self.path('history.json'))
+        uri = os.path.join(os.path.basename(self.tmpdir), 'subtests', '%s')
+        history.durations = {uri % 'docker_cli/one': [10, 20],
+                             uri % 'docker_cli/two': [30]}
+        step_init.history = history
+        self.assertEqual(step_init.shard_weights(subtests, 'history'),
+                         {'docker_cli/one': 15.0, 'docker_cli/two': 30.0,
+                          # Average of known
+                          'docker_cli/three': 22.5})
+
+
+class TestDurationHistory(ControlTestBase):
+
+    def history(self):
+        return self.control['DurationHistory'](self.path('history.json'))
+
+    def test_record(self):
+        history = self.history()
+        self.assertEqual(history.durations, {})
+        self.assertEqual(history.mean('foo'), None)
+        history.record('foo', 1.0)
+        # Another job records concurrently
+        self.history().record('bar', 5.0)
+        history.record('foo', 2.0)
+        self.assertEqual(self.history().durations,
+                         {'foo': [1.0, 2.0], 'bar': [5.0]})
+        self.assertEqual(history.mean('foo'), 1.5)
+        # No temporary files left behind
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         ['config_custom', 'history.json', 'results'])
+
+    def test_max_samples(self):
+        history = self.history()
+        for duration in xrange(history.max_samples + 5):
+            history.record('foo', duration)
+        self.assertEqual(self.history().durations['foo'],
+                         range(5, history.max_samples + 5))
+
+    def test_unusable(self):
+        with open(self.path('history.json'), 'wb') as history_file:
+            history_file.write('{"foo": [1')
+        self.assertEqual(self.history().durations, {})
+        history = self.control['DurationHistory'](self.path('nope', 'h.json'))
+        history.record('foo', 1.0)  # Logs warning, doesn't raise
+        self.assertEqual(history.durations, {'foo': [1.0]})
+
+    def test_percentile(self):
+        history = self.history()
+        history.durations = {'few': [1, 2], 'some': [40, 10, 30, 20],
+                             'many': range(100, 0, -1)}
+        self.assertEqual(history.percentile('few', 99), None)
+        self.assertEqual(history.percentile('none', 99), None)
+        # Nearest rank
+        self.assertEqual(history.percentile('some', 50), 20)
+        self.assertEqual(history.percentile('some', 51), 30)
+        self.assertEqual(history.percentile('some', 99), 40)
+        self.assertEqual(history.percentile('some', 0), 10)
+        self.assertEqual(history.percentile('many', 95), 95)
+        self.assertEqual(history.percentile('many', 99), 99)
+        self.assertEqual(history.percentile('many', 100), 100)
+
+
+class TestSchedule(ControlTestBase):
+
+    URIS = ['docker/subtests/a', 'docker/subtests/b', 'docker/subtests/c',
+            'docker/subtests/d']
+
+    def setUp(self):
+        super(TestSchedule, self).setUp()
+        self.step_init = self.control['step_init']
+        history = self.control['DurationHistory'](self.path('history.json'))
+        history.durations = {'docker/subtests/a': [10, 10, 10],
+                             'docker/subtests/b': [30, 10, 20, 40],
+                             'docker/subtests/d': [10, 10]}
+        self.step_init.history = history
+
+    def schedule(self, policy):
+        self.control_ini.set('Control', 'schedule', policy)
+        return self.step_init.schedule(list(self.URIS))
+
+    def test_load_history(self):
+        self.assertEqual(self.step_init.load_history().path,
+                         self.path('results', 'docker_durations.json'))
+        self.control_ini.set('Control', 'history', '')
+        self.assertEqual(self.step_init.load_history(), None)
+
+    def test_default(self):
+        self.assertEqual(self.schedule('default'), self.URIS)
+        self.assertEqual(self.schedule(''), self.URIS)
+        self.assertEqual(self.schedule('random'), self.URIS)
+        self.step_init.history = None
+        self.assertEqual(self.schedule('longest'), self.URIS)
+
+    def test_longest(self):
+        # Unknown first, equal durations in default order
+        self.assertEqual(self.schedule('longest'),
+                         ['docker/subtests/c', 'docker/subtests/b',
+                          'docker/subtests/a', 'docker/subtests/d'])
+
+    def test_shortest(self):
+        self.assertEqual(self.schedule('shortest'),
+                         ['docker/subtests/a', 'docker/subtests/d',
+                          'docker/subtests/b', 'docker/subtests/c'])
+
+    def test_timeouts(self):
+        timeouts = self.step_init.historical_timeouts
+        self.assertEqual(timeouts(self.URIS), {})
+        self.control_ini.set('Control', 'timeout_margin', '60')
+        # Only with enough history
+        self.assertEqual(timeouts(self.URIS),
+                         {'docker/subtests/a': 70, 'docker/subtests/b': 100})
+        self.step_init.history = None
+        self.assertEqual(timeouts(self.URIS), {})
+
+    def test_step_timeout(self):
+        self.control_ini.set('Control', 'timeout_margin', '60')
+        self.step_init.step_timeout = 0
+        self.step_init.step_timeouts = self.step_init.historical_timeouts(
+            self.URIS)
+        steps = [self.control['Step'](uri, self.step_init)
+                 for uri in self.URIS]
+        self.assertEqual([step.timeout for step in steps], [70, 100, 0, 0])
+
+
+if __name__ == '__main__':
+    main()
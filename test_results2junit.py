@@ -4,6 +4,8 @@ from unittest2 import TestCase, main
 
 import imp
 import os
+import shutil
+import tempfile
 
 results2junit = imp.load_source('results2junit', './results2junit')
 
@@ -29,6 +31,75 @@ class TestSubdir(TestCase):
         self.assertEqual(xml, expected_xml)
 
 
+class TestMerge(TestCase):
+    STATUS = ("START\t----\t----\ttimestamp=1000\tlocaltime=x\n"
+              "\tSTART\tdocker/subtests/docker_cli/abc.1\t"
+              "docker/subtests/docker_cli/abc.1\ttimestamp=1010\t"
+              "localtime=x\n"
+              "\t\t%s\tdocker/subtests/docker_cli/abc.1\t"
+              "docker/subtests/docker_cli/abc.1\ttimestamp=1020\t"
+              "localtime=x\tsome message\n"
+              "\tEND %s\tdocker/subtests/docker_cli/abc.1\t"
+              "docker/subtests/docker_cli/abc.1\ttimestamp=1020\t"
+              "localtime=x\n"
+              "END GOOD\t----\t----\ttimestamp=1100\tlocaltime=x\n")
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(BASE_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def results_dir(self, name, status):
+        results_dir = os.path.join(self.tmpdir, name)
+        os.mkdir(results_dir)
+        with open(os.path.join(results_dir, 'status'), 'w') as status_fh:
+            status_fh.write(self.STATUS % (status, status))
+        return results_dir
+
+    def test_merge_repeated(self):
+        ts = results2junit.MergedTestSuite('merged')
+        for _ in range(2):
+            ts.add_results_dir(os.path.join(TEST_SUBDIR, '02complete'))
+        self.assertEqual(len(ts.testcases), 3)
+        self.assertEqual(ts.count['failures'], 1)
+        self.assertEqual(ts.count['skipped'], 1)
+        self.assertEqual(ts.time, 2 * 1604)
+        xml = ts.as_xml
+        self.assertIn('This is line 1 of an error message', xml)
+        self.assertIn('<property name="host.2.tests" value="3"/>', xml)
+
+    def test_last_wins(self):
+        ts = results2junit.MergedTestSuite('merged', 'last-wins')
+        ts.add_results_dir(self.results_dir('one', 'GOOD'))
+        ts.add_results_dir(self.results_dir('two', 'FAIL'))
+        self.assertEqual(ts.count, {'tests': 1, 'failures': 1,
+                                    'errors': 0, 'skipped': 0})
+        self.assertEqual(len(ts.testcases[0].attempts), 2)
+        self.assertNotIn('flakyFailure', ts.as_xml)
+
+    def test_flaky_if_mixed(self):
+        ts = results2junit.MergedTestSuite('merged', 'flaky-if-mixed')
+        ts.add_results_dir(self.results_dir('one', 'FAIL'))
+        ts.add_results_dir(self.results_dir('two', 'GOOD'))
+        ts.add_results_dir(self.results_dir('three', 'FAIL'))
+        self.assertEqual(ts.count['failures'], 0)
+        self.assertEqual(ts.as_xml.count('<flakyFailure '), 2)
+        outfile = os.path.join(self.tmpdir, 'merged.junit')
+        ts.write_xml(outfile)
+        self.assertEqual(open(outfile, 'r').read(), ts.as_xml)
+
+    def test_status_stream(self):
+        status_file = os.path.join(TEST_SUBDIR, '02complete', 'status')
+        stream = results2junit.StatusStream(status_file)
+        self.assertFalse(hasattr(stream, 'pop'))
+        self.assertEqual(list(stream),
+                         list(results2junit.AutotestResults(status_file)))
+        # Iterating again re-reads the file
+        self.assertEqual(len(list(stream)), 4)
+
+
 def test_generator(cwd, name):
     def test(self):
         self._test_subdir(name)
@@ -0,0 +1,86 @@
+# -*- python -*-
+
+from unittest2 import TestCase, main
+
+import imp
+import json
+import os
+import shutil
+import tempfile
+
+results2sqlite = imp.load_source('results2sqlite', './results2sqlite')
+
+STATUS = ("START\t----\t----\ttimestamp=1000\tlocaltime=x\n"
+          "\tSTART\tdocker/subtests/docker_cli/abc.1\t"
+          "docker/subtests/docker_cli/abc.1\ttimestamp=1000\tlocaltime=x\n"
+          "\t\tGOOD\tdocker/subtests/docker_cli/abc.1\t"
+          "docker/subtests/docker_cli/abc.1\ttimestamp=%d\tlocaltime=x\t"
+          "completed successfully\n"
+          "\tEND GOOD\tdocker/subtests/docker_cli/abc.1\t"
+          "docker/subtests/docker_cli/abc.1\ttimestamp=%d\tlocaltime=x\n"
+          "END GOOD\t----\t----\ttimestamp=2000\tlocaltime=x\n")
+
+
+class TestResultsDB(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = results2sqlite.ResultsDB(os.path.join(self.tmpdir, 'db'))
+        self.runs = 0
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def results_dir(self, run_time, pull_time, nvr='docker-1.13.1-1'):
+        self.runs += 1
+        results_dir = os.path.join(self.tmpdir, str(self.runs))
+        test_results = os.path.join(results_dir, 'docker', 'subtests',
+                                    'docker_cli', 'abc.1', 'results')
+        os.makedirs(test_results)
+        os.mkdir(os.path.join(results_dir, 'sysinfo'))
+        with open(os.path.join(results_dir, 'status'), 'w') as status_fh:
+            status_fh.write(STATUS % (1000 + run_time, 1000 + run_time))
+        with open(os.path.join(results_dir, 'sysinfo', 'key_rpms'),
+                  'w') as rpms_fh:
+            rpms_fh.write("%s.x86_64\n" % nvr)
+        with open(os.path.join(test_results, 'keyval'), 'w') as keyval_fh:
+            keyval_fh.write("run_once_wall{perf}=1.5\n")
+        with open(os.path.join(test_results, 'command_times.json'),
+                  'w') as times_fh:
+            json.dump([{'command': 'pull', 'subsubtest': None, 'start': 0,
+                        'duration': pull_time, 'exit_status': 0}], times_fh)
+        return results_dir
+
+    def test_ingest(self):
+        results_dir = self.results_dir(10, 2.0)
+        run_id = self.db.ingest(results_dir)
+        # Replaces, does not duplicate
+        run_id = self.db.ingest(results_dir)
+        runs = self.db.runs()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0][0], run_id)
+        self.assertEqual(runs[0][3], 'docker-1.13.1-1.x86_64')
+        self.assertEqual(self.db.means('step', run_id),
+                         {'subtests/docker_cli/abc': 10})
+        self.assertEqual(self.db.means('command', run_id), {'pull': 2.0})
+        self.assertEqual(self.db.connection.execute(
+            "SELECT kind, key, value FROM keyvals").fetchall(),
+            [('perf', 'run_once_wall', '1.5')])
+
+    def test_regressions(self):
+        for run_time in (10, 12, 11):
+            self.db.ingest(self.results_dir(run_time, 2.0))
+        # Different NVR is not compared
+        self.db.ingest(self.results_dir(100, 1.0, 'docker-1.12.6-1'))
+        last = self.db.ingest(self.results_dir(30, 2.1))
+        self.assertEqual(len(self.db.previous_runs(last, 5)), 3)
+        self.assertEqual(self.db.regressions(last),
+                         [('step', 'subtests/docker_cli/abc', 30, 11)])
+        last = self.db.ingest(self.results_dir(10, 9.0))
+        self.assertEqual(self.db.regressions(last, count=1),
+                         [('command', 'pull', 9.0, 2.1)])
+
+
+if __name__ == '__main__':
+    main()